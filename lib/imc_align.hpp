@@ -0,0 +1,184 @@
+//---------------------------------------------------------------------------//
+
+#ifndef IMCALIGN
+#define IMCALIGN
+
+#include <algorithm>
+#include <limits>
+#include <numeric>
+#include <string>
+#include <vector>
+
+#include "imc_channel.hpp"
+
+//---------------------------------------------------------------------------//
+
+namespace imc
+{
+  // interpolation of channel data between samples
+  enum interpolation {
+    nearest,
+    linear,
+    hold
+  };
+
+  // get interpolation method by its name
+  interpolation get_interpolation(std::string method)
+  {
+    if ( method == "nearest" ) return interpolation::nearest;
+    else if ( method == "linear" ) return interpolation::linear;
+    else if ( method == "hold" ) return interpolation::hold;
+    else throw std::runtime_error(std::string("unknown interpolation method: ") + method);
+  }
+
+  // interpolate between two subsequent samples y0 and y1 at relative position
+  // frac \in [0,1) (with y1 being ignored for frac = 0)
+  double interpolate(interpolation method, double y0, double y1, double frac)
+  {
+    if ( frac == 0. || method == interpolation::hold ) return y0;
+    else if ( method == interpolation::nearest ) return ( frac <= 0.5 ) ? y0 : y1;
+    else return y0 + (y1 - y0)*frac;
+  }
+
+  // equidistant time grid (in nanoseconds since epoch)
+  struct timegrid
+  {
+    long long int start_ns_, step_ns_;
+    unsigned long int length_;
+
+    timegrid(): start_ns_(0), step_ns_(0), length_(0) {}
+  };
+
+  // determine common time grid covering all given channels (with the finest
+  // step width of all channels unless a step width is given)
+  timegrid get_timegrid(std::vector<imc::channel*>& channels, long long int step_ns = 0)
+  {
+    long long int first = std::numeric_limits<long long int>::max();
+    long long int last = std::numeric_limits<long long int>::min();
+    long long int finest = std::numeric_limits<long long int>::max();
+
+    for ( imc::channel* chn: channels )
+    {
+      unsigned long int num_values = chn->num_values_;
+      if ( num_values == 0 ) continue;
+
+      long long int chnfirst, chnlast;
+      if ( chn->dimension_ == 1 )
+      {
+        chnfirst = chn->get_xstart_ns();
+        chnlast = chnfirst + (long long int)(num_values-1)*chn->get_xstep_ns();
+      }
+      else
+      {
+        // abscissa is not necessarily monotonic
+        std::vector<long long int> xtime = chn->get_xtime_ns();
+        chnfirst = *std::min_element(xtime.begin(),xtime.end());
+        chnlast = *std::max_element(xtime.begin(),xtime.end());
+      }
+
+      first = std::min(first,chnfirst);
+      last = std::max(last,chnlast);
+      if ( num_values > 1 && chnlast > chnfirst )
+      {
+        finest = std::min(finest,(chnlast-chnfirst)/(long long int)(num_values-1));
+      }
+    }
+
+    timegrid grid;
+    if ( first > last ) return grid;
+
+    grid.start_ns_ = first;
+    grid.step_ns_ = ( step_ns > 0 ) ? step_ns : finest;
+    if ( grid.step_ns_ == std::numeric_limits<long long int>::max() )
+    {
+      // all channels consist of a single timestamp at most
+      grid.step_ns_ = 1;
+    }
+    grid.length_ = (unsigned long int)((last-first)/grid.step_ns_) + 1;
+
+    return grid;
+  }
+
+  // interpolate single channel onto time grid and write it into column "col"
+  // of row-major array "data" featuring "cols" columns
+  void align_channel(imc::channel& chn, const timegrid& grid, interpolation method,
+                     double* data, unsigned long int col, unsigned long int cols)
+  {
+    for ( unsigned long int r = 0; r < grid.length_; r++ )
+    {
+      data[r*cols+col] = std::numeric_limits<double>::quiet_NaN();
+    }
+
+    unsigned long int num_values = chn.num_values_;
+    if ( num_values == 0 ) return;
+    std::shared_ptr<const imc::channel_data> chndata = chn.data();
+    const std::vector<imc::datatype>& ydata = chndata->ydata_;
+
+    if ( chn.dimension_ == 1 )
+    {
+      // equidistant samples: locate sample preceding every row directly
+      long long int xstart = chn.get_xstart_ns();
+      long long int xstep = chn.get_xstep_ns();
+      for ( unsigned long int r = 0; r < grid.length_; r++ )
+      {
+        long long int dt = grid.start_ns_ + (long long int)r*grid.step_ns_ - xstart;
+        if ( dt < 0 ) continue;
+        if ( xstep <= 0 )
+        {
+          if ( dt == 0 ) data[r*cols+col] = ydata[0].as_double();
+          continue;
+        }
+        unsigned long int i = (unsigned long int)(dt/xstep);
+        long long int rest = dt%xstep;
+        if ( i >= num_values || ( i == num_values-1 && rest > 0 ) ) break;
+        double y1 = ( rest > 0 ) ? ydata[i+1].as_double() : 0.;
+        data[r*cols+col] = interpolate(method,ydata[i].as_double(),y1,
+                                       (double)rest/(double)xstep);
+      }
+    }
+    else
+    {
+      // samples with explicit abscissa: walk along samples (in order of their
+      // abscissa, which is not necessarily monotonic) and rows at once
+      std::vector<long long int> xtime = chn.get_xtime_ns();
+      std::vector<unsigned long int> order(num_values);
+      std::iota(order.begin(),order.end(),0UL);
+      if ( !std::is_sorted(xtime.begin(),xtime.end()) )
+      {
+        std::stable_sort(order.begin(),order.end(),
+          [&xtime](unsigned long int a, unsigned long int b) { return xtime[a] < xtime[b]; });
+      }
+
+      unsigned long int i = 0;
+      for ( unsigned long int r = 0; r < grid.length_; r++ )
+      {
+        long long int t = grid.start_ns_ + (long long int)r*grid.step_ns_;
+        if ( t < xtime[order.front()] ) continue;
+        if ( t > xtime[order.back()] ) break;
+        while ( i+1 < num_values && xtime[order[i+1]] <= t ) i++;
+        long long int rest = t - xtime[order[i]];
+        double y1 = ( rest > 0 ) ? ydata[order[i+1]].as_double() : 0.;
+        double frac = ( rest > 0 ) ? (double)rest/(double)(xtime[order[i+1]]-xtime[order[i]]) : 0.;
+        data[r*cols+col] = interpolate(method,ydata[order[i]].as_double(),y1,frac);
+      }
+    }
+  }
+
+  // align all given channels onto time grid by means of the given interpolation
+  // method, with "data" being a row-major array of size grid.length_ x channels.size()
+  void align_channels(std::vector<imc::channel*>& channels, const timegrid& grid,
+                      std::string method, double* data)
+  {
+    interpolation interp = get_interpolation(method);
+    unsigned long int cols = (unsigned long int)channels.size();
+    for ( unsigned long int c = 0; c < cols; c++ )
+    {
+      align_channel(*channels[c],grid,interp,data,c,cols);
+    }
+  }
+
+}
+
+#endif
+
+//---------------------------------------------------------------------------//
@@ -0,0 +1,171 @@
+//---------------------------------------------------------------------------//
+
+#ifndef IMCCACHE
+#define IMCCACHE
+
+#include <filesystem>
+#include <list>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+#include "imc_datatype.hpp"
+
+//---------------------------------------------------------------------------//
+
+namespace imc
+{
+  // identify file by its canonical path, size and time of last modification
+  std::string get_file_identity(std::string filename)
+  {
+    std::filesystem::path pf = std::filesystem::canonical(filename);
+    return pf.u8string()
+         + std::string(":") + std::to_string(std::filesystem::file_size(pf))
+         + std::string(":") + std::to_string(std::filesystem::last_write_time(pf).time_since_epoch().count());
+  }
+
+  // decoded samples of a channel
+  struct channel_data
+  {
+    std::vector<imc::datatype> xdata_, ydata_;
+
+    // number of bytes occupied by the samples
+    unsigned long long int size_bytes() const
+    {
+      return (unsigned long long int)sizeof(channel_data)
+           + (unsigned long long int)(xdata_.capacity()+ydata_.capacity())*sizeof(imc::datatype);
+    }
+  };
+
+  // statistics of cache
+  struct cache_stats
+  {
+    unsigned long long int budget_, size_;
+    unsigned long int entries_;
+    unsigned long int hits_, misses_, evictions_;
+  };
+
+  // process-wide cache of decoded channels (identified by file identity and
+  // channel uuid) limited to a budget of bytes by evicting the least recently
+  // used channels (a budget of 0 disables the cache)
+  class cache
+  {
+    typedef std::pair<std::string,std::string> cache_key;
+    typedef std::pair<cache_key,std::shared_ptr<const channel_data>> cache_entry;
+
+    // list of entries (most recently used first) and their index
+    std::list<cache_entry> entries_;
+    std::map<cache_key,std::list<cache_entry>::iterator> index_;
+
+    unsigned long long int budget_, size_;
+    unsigned long int hits_, misses_, evictions_;
+
+    std::mutex mutex_;
+
+    cache(): budget_(0), size_(0), hits_(0), misses_(0), evictions_(0) { }
+
+    // evict least recently used entries until given budget is met
+    void shrink(unsigned long long int budget)
+    {
+      while ( size_ > budget && !entries_.empty() )
+      {
+        size_ -= entries_.back().second->size_bytes();
+        index_.erase(entries_.back().first);
+        entries_.pop_back();
+        evictions_++;
+      }
+    }
+
+  public:
+
+    cache(const cache&) = delete;
+    cache& operator=(const cache&) = delete;
+
+    // get single process-wide instance
+    static cache& instance()
+    {
+      static cache chc;
+      return chc;
+    }
+
+    // set budget of bytes (evicting entries as required)
+    void set_budget(unsigned long long int budget)
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      budget_ = budget;
+      shrink(budget_);
+    }
+
+    // check whether cache is enabled
+    bool enabled()
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      return budget_ > 0;
+    }
+
+    // look up decoded channel (null pointer if not cached)
+    std::shared_ptr<const channel_data> get(std::string fileid, std::string uuid)
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      auto it = index_.find(cache_key(fileid,uuid));
+      if ( it == index_.end() )
+      {
+        misses_++;
+        return nullptr;
+      }
+      hits_++;
+      entries_.splice(entries_.begin(),entries_,it->second);
+      return it->second->second;
+    }
+
+    // add decoded channel (unless it exceeds the budget on its own)
+    void put(std::string fileid, std::string uuid, std::shared_ptr<const channel_data> data)
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      cache_key key(fileid,uuid);
+      auto it = index_.find(key);
+      if ( it != index_.end() )
+      {
+        size_ -= it->second->second->size_bytes();
+        entries_.erase(it->second);
+        index_.erase(it);
+      }
+      if ( data->size_bytes() > budget_ ) return;
+      shrink(budget_ - data->size_bytes());
+      entries_.push_front(cache_entry(key,data));
+      index_[key] = entries_.begin();
+      size_ += data->size_bytes();
+    }
+
+    // remove all entries and reset counters
+    void clear()
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      entries_.clear();
+      index_.clear();
+      size_ = 0;
+      hits_ = misses_ = evictions_ = 0;
+    }
+
+    // get statistics
+    cache_stats get_stats()
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      cache_stats stats;
+      stats.budget_ = budget_;
+      stats.size_ = size_;
+      stats.entries_ = (unsigned long int)entries_.size();
+      stats.hits_ = hits_;
+      stats.misses_ = misses_;
+      stats.evictions_ = evictions_;
+      return stats;
+    }
+  };
+
+}
+
+#endif
+
+//---------------------------------------------------------------------------//
@@ -6,6 +6,10 @@
 #include "imc_datatype.hpp"
 #include "imc_conversion.hpp"
 #include "imc_block.hpp"
+#include "imc_cache.hpp"
+#include <algorithm>
+#include <fstream>
+#include <memory>
 #include <sstream>
 #include <math.h>
 #include <chrono>
@@ -143,7 +147,7 @@ namespace imc
 
   // given a list of numeric objects, join it into a string
   template<typename dt>
-  std::string joinvec(std::vector<dt> myvec, unsigned long int limit = 10, int prec = 10, bool fixed = true)
+  std::string joinvec(const std::vector<dt>& myvec, unsigned long int limit = 10, int prec = 10, bool fixed = true)
   {
     // include entire list for limit = 0
     unsigned long int myvecsize = (unsigned long int)myvec.size();
@@ -153,7 +157,7 @@ namespace imc
     ss<<"[";
     if ( myvec.size() <= limit )
     {
-      for ( dt el: myvec )
+      for ( const dt& el: myvec )
       {
         customize_stream(ss,prec,fixed);
         ss<<el<<",";
@@ -180,6 +184,26 @@ namespace imc
     return sumstr;
   }
 
+  // get number of nanoseconds per given unit of time (assuming seconds for empty
+  // unit unless it is required explicitly)
+  double time_unit_ns(std::string unit, bool explicit_unit = false)
+  {
+    // ignore any enclosing double quotes
+    if ( unit.size() > 1 && unit.front() == '"' && unit.back() == '"' )
+    {
+      unit = unit.substr(1,unit.size()-2);
+    }
+
+    if ( ( unit.empty() && !explicit_unit ) || unit == "s" ) return 1.e9;
+    else if ( unit == "ms" ) return 1.e6;
+    else if ( unit == "us" || unit == "\xc2\xb5s" || unit == "\xb5s" ) return 1.e3;
+    else if ( unit == "ns" ) return 1.;
+    else if ( unit == "min" ) return 60.e9;
+    else if ( unit == "h" ) return 3600.e9;
+    else if ( unit == "d" ) return 86400.e9;
+    else throw std::domain_error(std::string("abscissa unit is not a unit of time: ") + unit);
+  }
+
   #if defined(__linux__) || defined(__APPLE__)
   // convert encoding of any descriptions, channel-names, units etc.
   class iconverter
@@ -208,10 +232,22 @@ namespace imc
         }
       }
 
+      // descriptor is released by destructor only
+      iconverter(const iconverter&) = delete;
+      iconverter& operator=(const iconverter&) = delete;
+
+      ~iconverter()
+      {
+        if ( (iconv_t)-1 != cd_ ) iconv_close(cd_);
+      }
+
       void convert(std::string &astring)
       {
         if ( astring.empty() ) return;
 
+        // reset conversion state of (reused) descriptor
+        iconv(cd_,nullptr,nullptr,nullptr,nullptr);
+
         std::vector<char> in_buffer(astring.begin(),astring.end());
         char *inbuf = &in_buffer[0];
         size_t inbytes = in_buffer.size();
@@ -261,6 +297,19 @@ namespace imc
   };
   #endif
 
+  // get converter for given encodings, which is set up once per thread only
+  iconverter& get_iconverter(std::string in_enc, std::string out_enc)
+  {
+    thread_local std::map<std::string,std::unique_ptr<iconverter>> converters;
+    std::string encs = in_enc + std::string(">") + out_enc;
+    std::map<std::string,std::unique_ptr<iconverter>>::iterator it = converters.find(encs);
+    if ( it == converters.end() )
+    {
+      it = converters.emplace(encs,std::unique_ptr<iconverter>(new iconverter(in_enc,out_enc))).first;
+    }
+    return *(it->second);
+  }
+
   struct component_group
   {
     imc::component CC_;
@@ -343,7 +392,6 @@ namespace imc
     unsigned long int xbuffer_size_, ybuffer_size_;
     long int addtime_;
     imc::numtype xdatatp_, ydatatp_;
-    std::vector<imc::datatype> xdata_, ydata_;
 
     // range, factor and offset
     double xfactor_, yfactor_;
@@ -353,12 +401,25 @@ namespace imc
     unsigned long int group_index_;
     std::string group_uuid_, group_name_, group_comment_;
 
+    // raw-file the channel belongs to (and its identity for the cache of channels)
+    std::string raw_file_, file_id_;
+
+    // offset of first byte of binary data in CS block and number of values
+    unsigned long int buffer_begin_, num_values_;
+
+    // decoded data (retained by channel unless managed by cache of channels)
+    std::shared_ptr<const imc::channel_data> data_;
+
     // constructor takes channel's block environment
     channel(channel_env &chnenv, std::map<std::string,imc::block>* blocks,
-                                 std::vector<unsigned char>* buffer):
+                                 std::vector<unsigned char>* buffer,
+            std::string raw_file = std::string(""), std::string file_id = std::string("")):
       chnenv_(chnenv), blocks_(blocks), buffer_(buffer),
+      trigger_time_frac_secs_(0.), xstepwidth_(0.), xstart_(0.), dimension_(0),
+      ysignbits_(0), ybuffer_size_(0), addtime_(0),
       xfactor_(1.), yfactor_(1.), xoffset_(0.), yoffset_(0.),
-      group_index_(-1)
+      group_index_(-1), raw_file_(raw_file), file_id_(file_id),
+      buffer_begin_(0), num_values_(0)
     {
       // use uuid from CN block
       uuid_ = chnenv_.CNuuid_;
@@ -457,6 +518,7 @@ namespace imc
         ybuffer_size_ = comp_group1.Cb_.number_bytes_;
         xfactor_ = comp_group2.CR_.factor_;
         xoffset_ = comp_group2.CR_.offset_;
+        xunit_ = comp_group2.CR_.unit_;
         yfactor_ = comp_group1.CR_.factor_;
         yoffset_ = comp_group1.CR_.offset_;
         xdatatp_ = comp_group2.CP_.numeric_type_;
@@ -474,79 +536,221 @@ namespace imc
         // no datafield
       }
 
-      // start converting binary buffer to imc::datatype
-      if ( !chnenv_.CSuuid_.empty() ) convert_buffer();
+      // find appropriate precision for "xdata_" by means of "xstepwidth_"
+      if ( dimension_ == 2 ) xprec_ = 9;
+      else xprec_ = (xstepwidth_ > 0 ) ? (int)ceil(fabs(log10(xstepwidth_))) : 10;
+
+      // locate binary buffer (which is converted to imc::datatype on demand only)
+      if ( !chnenv_.CSuuid_.empty() ) locate_buffer();
 
-      // convert any non-UTF-8 codepage to UTF-8 and cleanse any text
+      // convert any non-UTF-8 codepage to UTF-8
       convert_encoding();
-      cleanse_text();
     }
 
-    // convert buffer to actual datatype
-    void convert_buffer()
+    // locate (channel dependent) part of buffer and check its consistency
+    void locate_buffer()
     {
-      std::vector<imc::parameter> prms = blocks_->at(chnenv_.CSuuid_).get_parameters();
+      std::vector<imc::parameter>& prms = blocks_->at(chnenv_.CSuuid_).get_parameters();
       if ( prms.size() < 4)
       {
         throw std::runtime_error("CS block is invalid and features to few parameters");
       }
-
-      // extract (channel dependent) part of buffer
-      unsigned long int buffstrt = prms[3].begin();
-      std::vector<unsigned char> yCSbuffer( buffer_->begin()+buffstrt+ybuffer_offset_+1,
-                                           buffer_->begin()+buffstrt+ybuffer_offset_+ybuffer_size_+1 );
+      buffer_begin_ = prms[3].begin();
 
       // determine number of values in buffer
-      unsigned long int ynum_values = (unsigned long int)(yCSbuffer.size()/(ysignbits_/8));
-      if ( ynum_values*(ysignbits_/8) != yCSbuffer.size() )
+      num_values_ = ybuffer_size_/(unsigned long int)(ysignbits_/8);
+      if ( num_values_*(unsigned long int)(ysignbits_/8) != ybuffer_size_ )
       {
         throw std::runtime_error("CSbuffer and significant bits of y datatype don't match");
       }
 
+      if ( dimension_ == 2 )
+      {
+        unsigned long int xnum_values = xbuffer_size_/(unsigned long int)(xsignbits_/8);
+        if ( xnum_values*(unsigned long int)(xsignbits_/8) != xbuffer_size_ )
+        {
+          throw std::runtime_error("CSbuffer and significant bits of x datatype don't match");
+        }
+        if ( xnum_values != num_values_ )
+        {
+          throw std::runtime_error("x and y data have different number of values");
+        }
+      }
+      else if ( dimension_ != 1 )
+      {
+        throw std::runtime_error("unsupported dimension");
+      }
+    }
+
+    // extract (channel dependent) part of buffer, which is read from the
+    // raw-file itself if the buffer was released after parsing
+    // (any bytes missing in a truncated buffer are set to zero)
+    std::vector<unsigned char> extract_buffer(unsigned long int offset, unsigned long int size)
+    {
+      std::vector<unsigned char> CSbuffer(size,0);
+      extract_buffer(offset,size,CSbuffer.data());
+      return CSbuffer;
+    }
+
+    // extract (channel dependent) part of buffer into given memory of size bytes
+    void extract_buffer(unsigned long int offset, unsigned long int size, unsigned char* CSbuffer)
+    {
+      unsigned long int buffstrt = buffer_begin_ + offset + 1;
+      std::fill(CSbuffer,CSbuffer+size,(unsigned char)0);
+      if ( !buffer_->empty() )
+      {
+        if ( buffstrt < buffer_->size() )
+        {
+          unsigned long int avail = std::min(size,(unsigned long int)buffer_->size()-buffstrt);
+          std::copy(buffer_->begin()+buffstrt,buffer_->begin()+buffstrt+avail,CSbuffer);
+        }
+        return;
+      }
+
+      if ( imc::get_file_identity(raw_file_) != file_id_ )
+      {
+        throw std::runtime_error(std::string("raw-file was modified after parsing: ") + raw_file_);
+      }
+      std::ifstream fin(raw_file_.c_str(),std::ifstream::binary);
+      fin.seekg((std::streamoff)buffstrt);
+      fin.read(reinterpret_cast<char*>(CSbuffer),(std::streamsize)size);
+      if ( fin.bad() || !fin.is_open() )
+      {
+        throw std::runtime_error(std::string("failed to read data of channel from raw-file: ") + raw_file_);
+      }
+    }
+
+    // copy first "size" bytes of raw counts of ordinate (or abscissa), i.e. of
+    // samples in their native numeric type prior to applying factor and offset,
+    // into given memory without decoding them
+    void copy_raw_counts(unsigned char* counts, unsigned long int size, bool xdata = false)
+    {
+      if ( xdata && dimension_ != 2 )
+      {
+        throw std::runtime_error("raw counts of abscissa are available for XY channels only");
+      }
+      if ( size > ( xdata ? xbuffer_size_ : ybuffer_size_ ) )
+      {
+        throw std::runtime_error("raw counts exceed buffer of channel");
+      }
+      if ( chnenv_.CSuuid_.empty() || size == 0 ) return;
+      extract_buffer(xdata ? xbuffer_offset_ : ybuffer_offset_,size,counts);
+    }
+
+    // convert buffer to actual datatype
+    std::shared_ptr<imc::channel_data> convert_buffer()
+    {
+      std::shared_ptr<imc::channel_data> chndata = std::make_shared<imc::channel_data>();
+      if ( chnenv_.CSuuid_.empty() ) return chndata;
+
+      std::vector<unsigned char> yCSbuffer = extract_buffer(ybuffer_offset_,ybuffer_size_);
 
       if (dimension_ ==  1)
       {
         // process y-data
-        process_data(ydata_, ynum_values, ydatatp_, yCSbuffer);
-
-        // find appropriate precision for "xdata_" by means of "xstepwidth_"
-        xprec_ = (xstepwidth_ > 0 ) ? (int)ceil(fabs(log10(xstepwidth_))) : 10;
+        process_data(chndata->ydata_, num_values_, ydatatp_, yCSbuffer);
 
         // fill xdata_
-        for ( unsigned long int i = 0; i < ynum_values; i++ )
+        chndata->xdata_.reserve(num_values_);
+        for ( unsigned long int i = 0; i < num_values_; i++ )
         {
-          xdata_.push_back(xstart_+(double)i*xstepwidth_);
+          chndata->xdata_.push_back(xstart_+(double)i*xstepwidth_);
         }
       }
-      else if (dimension_ == 2)
+      else
       {
         // process x- and y-data
-        std::vector<unsigned char> xCSbuffer( buffer_->begin()+buffstrt+xbuffer_offset_+1,
-                                            buffer_->begin()+buffstrt+xbuffer_offset_+xbuffer_size_+1 );
+        std::vector<unsigned char> xCSbuffer = extract_buffer(xbuffer_offset_,xbuffer_size_);
+        process_data(chndata->xdata_, num_values_, xdatatp_, xCSbuffer);
+        process_data(chndata->ydata_, num_values_, ydatatp_, yCSbuffer);
+      }
 
-        // determine number of values in buffer
-        unsigned long int xnum_values = (unsigned long int)(xCSbuffer.size()/(xsignbits_/8));
-        if ( xnum_values*(xsignbits_/8) != xCSbuffer.size() )
-        {
-          throw std::runtime_error("CSbuffer and significant bits of x datatype don't match");
-        }
-        if ( xnum_values != ynum_values )
-        {
-          throw std::runtime_error("x and y data have different number of values");
-        }
+      transformData(chndata->xdata_, xfactor_, xoffset_);
+      transformData(chndata->ydata_, yfactor_, yoffset_);
 
-        xprec_ = 9;
+      return chndata;
+    }
+
+    // get decoded data (looked up in/added to cache of channels if enabled)
+    std::shared_ptr<const imc::channel_data> data()
+    {
+      if ( data_ ) return data_;
 
-        process_data(xdata_, xnum_values, xdatatp_, xCSbuffer);
-        process_data(ydata_, ynum_values, ydatatp_, yCSbuffer);
+      imc::cache& chc = imc::cache::instance();
+      if ( file_id_.empty() || !chc.enabled() )
+      {
+        data_ = convert_buffer();
+        return data_;
       }
-      else
+
+      std::shared_ptr<const imc::channel_data> chndata = chc.get(file_id_,uuid_);
+      if ( !chndata )
       {
-        throw std::runtime_error("unsupported dimension");
+        chndata = convert_buffer();
+        chc.put(file_id_,uuid_,chndata);
+      }
+      return chndata;
+    }
+
+    // decode ordinate (or abscissa) straight from the buffer into given memory
+    // of num_values_ doubles, applying factor and offset in the same pass
+    // (without any intermediate vector of imc::datatype)
+    void decode_values(double* values, bool xdata = false)
+    {
+      if ( xdata && dimension_ != 2 )
+      {
+        throw std::runtime_error("abscissa is available for XY channels only");
+      }
+      if ( chnenv_.CSuuid_.empty() || num_values_ == 0 ) return;
+
+      std::vector<unsigned char> CSbuffer = xdata ? extract_buffer(xbuffer_offset_,xbuffer_size_)
+                                                  : extract_buffer(ybuffer_offset_,ybuffer_size_);
+      numtype datatp = xdata ? xdatatp_ : ydatatp_;
+      double factor = xdata ? xfactor_ : yfactor_;
+      double offset = xdata ? xoffset_ : yoffset_;
+      if ( factor == 0.0 ) factor = 1.0;
+
+      switch (datatp)
+      {
+          case numtype::unsigned_byte:
+              imc::decode_data_to_double<imc_Ubyte>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          case numtype::signed_byte:
+              imc::decode_data_to_double<imc_Sbyte>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          case numtype::unsigned_short:
+              imc::decode_data_to_double<imc_Ushort>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          case numtype::signed_short:
+              imc::decode_data_to_double<imc_Sshort>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          case numtype::unsigned_long:
+              imc::decode_data_to_double<imc_Ulongint>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          case numtype::signed_long:
+              imc::decode_data_to_double<imc_Slongint>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          case numtype::ffloat:
+              imc::decode_data_to_double<imc_float>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          case numtype::ddouble:
+              imc::decode_data_to_double<imc_double>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          case numtype::two_byte_word_digital:
+              imc::decode_data_to_double<imc_digital>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          case numtype::six_byte_unsigned_long:
+              imc::decode_data_to_double<imc_sixbyte>(CSbuffer, values, num_values_, factor, offset);
+              break;
+          default:
+              throw std::runtime_error(std::string("unsupported/unknown datatype ") + std::to_string(datatp));
       }
+    }
 
-      transformData(xdata_, xfactor_, xoffset_);
-      transformData(ydata_, yfactor_, yoffset_);
+    // get number of bytes occupied by decoded data retained by channel
+    unsigned long long int decoded_size()
+    {
+      return data_ ? data_->size_bytes() : 0;
     }
 
     // handle data type conversion
@@ -610,9 +814,8 @@ namespace imc
         // construct iconv-compatible name for respective codepage
         std::string cpn = std::string("CP") + codepage_;
 
-        // set up converter
-        std::string utf = std::string("UTF-8");
-        iconverter conv(cpn,utf);
+        // get (reused) converter
+        iconverter& conv = get_iconverter(cpn,std::string("UTF-8"));
 
         conv.convert(name_);
         conv.convert(comment_);
@@ -629,35 +832,6 @@ namespace imc
       }
     }
 
-    void cleanse_text()
-    {
-      escape_backslash(name_);
-      escape_backslash(comment_);
-      escape_backslash(origin_);
-      escape_backslash(origin_comment_);
-      escape_backslash(text_);
-      escape_backslash(language_code_);
-      escape_backslash(yname_);
-      escape_backslash(yunit_);
-      escape_backslash(xname_);
-      escape_backslash(xunit_);
-      escape_backslash(group_name_);
-      escape_backslash(group_comment_);
-    }
-
-    void escape_backslash(std::string &text)
-    {
-      char backslash = 0x5c;
-      std::string doublebackslash("\\\\");
-      for ( std::string::iterator it = text.begin(); it != text.end(); ++it )
-      {
-	if ( int(*it) == backslash ) {
-	  text.replace(it,it+1,doublebackslash);
-	  ++it;
-	}
-      }
-    }
-
     // get info string
     std::string get_info(int width = 20)
     {
@@ -665,6 +839,8 @@ namespace imc
       std::time_t tt = std::chrono::system_clock::to_time_t(trigger_time_);
       std::time_t att = std::chrono::system_clock::to_time_t(absolute_trigger_time_);
 
+      std::shared_ptr<const imc::channel_data> chndata = data();
+
       std::stringstream ss;
       ss<<std::setw(width)<<std::left<<"uuid:"<<uuid_<<"\n"
         <<std::setw(width)<<std::left<<"name:"<<name_<<"\n"
@@ -690,12 +866,58 @@ namespace imc
         <<std::setw(width)<<std::left<<"offset:"<<yoffset_<<"\n"
         <<std::setw(width)<<std::left<<"group:"<<"("<<group_index_<<","<<group_name_
                                                     <<","<<group_comment_<<")"<<"\n"
-        <<std::setw(width)<<std::left<<"ydata:"<<imc::joinvec<imc::datatype>(ydata_,6,9,true)<<"\n"
-        <<std::setw(width)<<std::left<<"xdata:"<<imc::joinvec<imc::datatype>(xdata_,6,xprec_,true)<<"\n";
+        <<std::setw(width)<<std::left<<"ydata:"<<imc::joinvec<imc::datatype>(chndata->ydata_,6,9,true)<<"\n"
+        <<std::setw(width)<<std::left<<"xdata:"<<imc::joinvec<imc::datatype>(chndata->xdata_,6,xprec_,true)<<"\n";
         // <<std::setw(width)<<std::left<<"aff. blocks:"<<chnenv_.get_json()<<"\n";
       return ss.str();
     }
 
+    // get trigger-time (or absolute trigger-time) in seconds since epoch
+    std::time_t get_trigger_time(bool absolute = false)
+    {
+      return std::chrono::system_clock::to_time_t(absolute ? absolute_trigger_time_
+                                                           : trigger_time_);
+    }
+
+    // get absolute time of first sample in nanoseconds since epoch
+    long long int get_xstart_ns()
+    {
+      long long int trgns = (long long int)get_trigger_time(true)*1000000000LL
+                          + llround(trigger_time_frac_secs_*1.e9);
+      return trgns + llround(xstart_*time_unit_ns(xunit_,dimension_ == 2));
+    }
+
+    // get (equidistant) step width of abscissa in nanoseconds
+    long long int get_xstep_ns()
+    {
+      return llround(xstepwidth_*time_unit_ns(xunit_));
+    }
+
+    // get absolute time of all samples in nanoseconds since epoch
+    std::vector<long long int> get_xtime_ns()
+    {
+      std::vector<long long int> xtime(num_values_);
+      long long int xstartns = get_xstart_ns();
+      if ( dimension_ == 1 )
+      {
+        long long int xstepns = get_xstep_ns();
+        for ( unsigned long int i = 0; i < xtime.size(); i++ )
+        {
+          xtime[i] = xstartns + (long long int)i*xstepns;
+        }
+      }
+      else
+      {
+        double unitns = time_unit_ns(xunit_,true);
+        std::shared_ptr<const imc::channel_data> chndata = data();
+        for ( unsigned long int i = 0; i < xtime.size(); i++ )
+        {
+          xtime[i] = xstartns + llround(chndata->xdata_[i].as_double()*unitns);
+        }
+      }
+      return xtime;
+    }
+
     // provide JSON string of metadata
     std::string get_json(bool include_data = false)
     {
@@ -705,15 +927,15 @@ namespace imc
 
       std::stringstream ss;
       ss<<"{"<<"\"uuid\":\""<<uuid_
-             <<"\",\"name\":\""<<name_
-             <<"\",\"comment\":\""<<comment_
-             <<"\",\"origin\":\""<<origin_
-             <<"\",\"origin-comment\":\""<<origin_comment_
-             <<"\",\"description\":\""<<text_
+             <<"\",\"name\":\""<<prepjsonstr(name_)
+             <<"\",\"comment\":\""<<prepjsonstr(comment_)
+             <<"\",\"origin\":\""<<prepjsonstr(origin_)
+             <<"\",\"origin-comment\":\""<<prepjsonstr(origin_comment_)
+             <<"\",\"description\":\""<<prepjsonstr(text_)
              <<"\",\"trigger-time-nt\":\""<<std::put_time(std::gmtime(&tt),"%FT%T")
              <<"\",\"trigger-time\":\""<<std::put_time(std::gmtime(&att),"%FT%T")
-             <<"\",\"language-code\":\""<<language_code_
-             <<"\",\"codepage\":\""<<codepage_
+             <<"\",\"language-code\":\""<<prepjsonstr(language_code_)
+             <<"\",\"codepage\":\""<<prepjsonstr(codepage_)
              <<"\",\"yname\":\""<<prepjsonstr(yname_)
              <<"\",\"yunit\":\""<<prepjsonstr(yunit_)
              <<"\",\"significantbits\":\""<<ysignbits_
@@ -723,12 +945,13 @@ namespace imc
              <<"\",\"xstepwidth\":\""<<xstepwidth_
              <<"\",\"xoffset\":\""<<xstart_
              <<"\",\"group\":{"<<"\"index\":\""<<group_index_
-                               <<"\",\"name\":\""<<group_name_
-                               <<"\",\"comment\":\""<<group_comment_<<"\""<<"}";
+                               <<"\",\"name\":\""<<prepjsonstr(group_name_)
+                               <<"\",\"comment\":\""<<prepjsonstr(group_comment_)<<"\""<<"}";
       if ( include_data )
       {
-        ss<<",\"ydata\":"<<imc::joinvec<imc::datatype>(ydata_,0,9,true)
-          <<",\"xdata\":"<<imc::joinvec<imc::datatype>(xdata_,0,xprec_,true);
+        std::shared_ptr<const imc::channel_data> chndata = data();
+        ss<<",\"ydata\":"<<imc::joinvec<imc::datatype>(chndata->ydata_,0,9,true)
+          <<",\"xdata\":"<<imc::joinvec<imc::datatype>(chndata->xdata_,0,xprec_,true);
       }
       // ss<<"\",\"aff. blocks\":\""<<chnenv_.get_json()
       ss<<"}";
@@ -758,6 +981,10 @@ namespace imc
     // print channel
     void print(std::string filename, const char sep = ',', int width = 25, int yprec = 9)
     {
+      std::shared_ptr<const imc::channel_data> chndata = data();
+      const std::vector<imc::datatype>& xdata = chndata->xdata_;
+      const std::vector<imc::datatype>& ydata = chndata->ydata_;
+
       std::ofstream fou(filename);
 
       // header
@@ -773,20 +1000,20 @@ namespace imc
         fou<<xname_<<sep<<yname_<<"\n"<<xunit_<<sep<<yunit_<<"\n";
       }
 
-      for ( unsigned long int i = 0; i < xdata_.size(); i++ )
+      for ( unsigned long int i = 0; i < xdata.size(); i++ )
       {
         if ( sep == ' ' )
         {
           fou<<std::setprecision(xprec_)<<std::fixed
-             <<std::setw(width)<<std::left<<xdata_[i]
+             <<std::setw(width)<<std::left<<xdata[i]
              <<std::setprecision(yprec)<<std::fixed
-             <<std::setw(width)<<std::left<<ydata_[i]<<"\n";
+             <<std::setw(width)<<std::left<<ydata[i]<<"\n";
         }
         else
         {
-          fou<<std::setprecision(xprec_)<<std::fixed<<xdata_[i]
+          fou<<std::setprecision(xprec_)<<std::fixed<<xdata[i]
              <<sep
-             <<std::setprecision(yprec)<<std::fixed<<ydata_[i]<<"\n";
+             <<std::setprecision(yprec)<<std::fixed<<ydata[i]<<"\n";
         }
       }
 
@@ -3,6 +3,7 @@
 #ifndef IMCCONVERSION
 #define IMCCONVERSION
 
+#include <cstring>
 #include <vector>
 
 //---------------------------------------------------------------------------//
@@ -44,6 +45,30 @@ namespace imc
     // for ( auto el: channel ) std::cout<<el<<"\n";
   }
 
+  // decode raw data in buffer of specific datatype straight into given memory
+  // of doubles, applying factor and offset in the same pass
+  template<typename datatype>
+  void decode_data_to_double(std::vector<unsigned char>& subbuffer, double* values,
+                             unsigned long int num_values, double factor, double offset)
+  {
+    // check number of elements of type "datatype" in buffer
+    if ( subbuffer.size() != num_values*sizeof(datatype) )
+    {
+      throw std::runtime_error( std::string("size mismatch between subbuffer (")
+                              + std::to_string(subbuffer.size())
+                              + std::string(") and datatype (")
+                              + std::to_string(num_values) + std::string("*")
+                              + std::to_string(sizeof(datatype)) + std::string(")") );
+    }
+
+    for ( unsigned long int i = 0; i < num_values; i++ )
+    {
+      datatype df;
+      std::memcpy(&df,subbuffer.data()+i*sizeof(datatype),sizeof(datatype));
+      values[i] = imc::datatype(df).as_double()*factor + offset;
+    }
+  }
+
 }
 
 #endif
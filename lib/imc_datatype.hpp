@@ -178,7 +178,7 @@ namespace imc
     }
 
     // obtain number as double
-    double as_double()
+    double as_double() const
     {
       double num = 0.0;
       if ( dtidx_ == 0 ) num = (double)ubyte_;
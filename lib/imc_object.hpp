@@ -378,6 +378,9 @@ namespace imc
     bool calibration_;       // 1 = true: calibration, 0 = false: no calibration
     std::string unit_;
 
+    // values are taken as they are without any CR block
+    range(): transform_(false), factor_(1.), offset_(0.), calibration_(false) {}
+
     // construct members by parsing particular parameters from buffer
     void parse(const std::vector<unsigned char>* buffer, const std::vector<parameter>& parameters)
     {
@@ -505,6 +508,8 @@ namespace imc
     std::tm tms_;
     double trigger_time_frac_secs_;
 
+    triggertime(): tms_(), trigger_time_frac_secs_(0.) {}
+
     // construct members by parsing particular parameters from buffer
     void parse(const std::vector<unsigned char>* buffer, const std::vector<parameter>& parameters)
     {
@@ -5,7 +5,15 @@
 
 #include <fstream>
 #include <filesystem>
+#include <algorithm>
+#include <atomic>
+#include <exception>
 #include <iostream>
+#include <regex>
+#include <set>
+#include <thread>
+#include <tuple>
+#include <utility>
 
 // #include "hexshow.hpp"
 #include "imc_key.hpp"
@@ -14,16 +22,69 @@
 #include "imc_object.hpp"
 #include "imc_result.hpp"
 #include "imc_channel.hpp"
+#include "imc_align.hpp"
 
 //---------------------------------------------------------------------------//
 
 namespace imc
 {
+  // selection of channels by (literal) uuid or name and/or by regular
+  // expression (in ECMAScript syntax) matching the name, with an empty
+  // selection including all channels
+  class selection
+  {
+    std::vector<std::string> channels_;
+    std::vector<std::regex> patterns_;
+
+  public:
+
+    selection() { }
+    selection(std::vector<std::string> channels, std::vector<std::string> patterns):
+      channels_(channels)
+    {
+      for ( std::string& ptn: patterns )
+      {
+        // regular expressions are given in ECMAScript syntax (i.e. without
+        // any inline flags)
+        try {
+          patterns_.push_back(std::regex(ptn));
+        } catch ( const std::regex_error& e ) {
+          throw std::runtime_error(std::string("invalid regular expression (ECMAScript) in selection of channels: ")
+                                   + ptn + std::string(" (") + e.what() + std::string(")"));
+        }
+      }
+    }
+
+    // check whether selection includes all channels
+    bool empty() const
+    {
+      return channels_.empty() && patterns_.empty();
+    }
+
+    // check whether channel is selected by its uuid or (UTF-8) name
+    bool matches(const std::string& uuid, const std::string& name) const
+    {
+      if ( this->empty() ) return true;
+      for ( const std::string& sel: channels_ )
+      {
+        if ( sel == uuid || sel == name ) return true;
+      }
+      for ( const std::regex& rgx: patterns_ )
+      {
+        if ( std::regex_match(name,rgx) ) return true;
+      }
+      return false;
+    }
+  };
+
   class raw
   {
     // (path of) raw-file and its basename
     std::string raw_file_, file_name_;
 
+    // identity of raw-file (as used by cache of channels)
+    std::string file_id_;
+
     // buffer of raw-file
     std::vector<unsigned char> buffer_;
 
@@ -37,24 +98,78 @@ namespace imc
     // list groups and channels (including their affiliate blocks)
     std::map<std::string,imc::channel> channels_;
 
+    // selection of channels
+    imc::selection selection_;
+
+    // number of threads decoding channels (0 = number of hardware threads)
+    unsigned int threads_;
+
+    // defer decoding of channels until their data is requested
+    bool deferred_;
+
   public:
 
     // constructor
-    raw() { };
-    raw(std::string raw_file): raw_file_(raw_file) { set_file(raw_file); };
-
-    // provide new raw-file
-    void set_file(std::string raw_file)
+    raw(): threads_(1), deferred_(false) { };
+    raw(std::string raw_file): raw_file_(raw_file), threads_(1), deferred_(false) { set_file(raw_file); };
+
+    // blocks and channels refer to the buffer of the instance
+    raw(const raw&) = delete;
+    raw& operator=(const raw&) = delete;
+
+    // provide new raw-file (and optionally select the channels to be processed
+    // by their uuids or names and/or regular expressions matching their names)
+    void set_file(std::string raw_file,
+                  std::vector<std::string> channels = std::vector<std::string>(),
+                  std::vector<std::string> patterns = std::vector<std::string>())
     {
       raw_file_ = raw_file;
+      selection_ = imc::selection(channels,patterns);
       this->fill_buffer();
+      file_id_ = imc::get_file_identity(raw_file_);
       this->parse_blocks();
       this->generate_block_map();
       this->generate_channel_env();
+      this->load_channels();
+    }
+
+    // set number of threads decoding the channels of any subsequent raw-file
+    // (with 0 choosing the number of hardware threads)
+    void set_threads(unsigned int threads)
+    {
+      threads_ = threads;
+    }
+
+    // defer decoding of channels of any subsequent raw-file until their data
+    // is requested (instead of decoding all of them right after parsing)
+    void set_deferred(bool deferred)
+    {
+      deferred_ = deferred;
     }
 
   private:
 
+    // check whether channel is selected by its uuid or (UTF-8) name
+    bool is_selected(imc::channel_env& chnenv)
+    {
+      if ( selection_.empty() ) return true;
+
+      // obtain name from CN block (in the same encoding as the channel does)
+      imc::channelobj CN;
+      CN.parse(&buffer_, mapblocks_.at(chnenv.CNuuid_).get_parameters());
+      if ( mapblocks_.count(chnenv.NLuuid_) == 1 )
+      {
+        imc::language NL;
+        NL.parse(&buffer_, mapblocks_.at(chnenv.NLuuid_).get_parameters());
+        if ( !NL.codepage_.empty() )
+        {
+          get_iconverter(std::string("CP") + NL.codepage_,std::string("UTF-8")).convert(CN.name_);
+        }
+      }
+
+      return selection_.matches(chnenv.CNuuid_,CN.name_);
+    }
+
     // open file and stream data into buffer
     void fill_buffer()
     {
@@ -137,7 +252,7 @@ namespace imc
                                      raw_file_, &buffer_);
 
                 // add block to list
-                rawblocks_.push_back(blk);
+                rawblocks_.push_back(std::move(blk));
 
                 // skip the remaining block according to its length
                 if ( (unsigned long int)(it-buffer_.begin()+length) < (unsigned long int)(buffer_.size()) )
@@ -196,7 +311,7 @@ namespace imc
     {
       mapblocks_.clear();
 
-      for ( imc::block blk: rawblocks_ )
+      for ( imc::block& blk: rawblocks_ )
       {
         mapblocks_.insert( std::pair<std::string,imc::block>(blk.get_uuid(),blk) );
       }
@@ -215,7 +330,7 @@ namespace imc
 
       // collect affiliate blocks for every channel WITH CHANNEL and AFFILIATE
       // BLOCK CORRESPONDENCE GOVERNED BY BLOCK ORDER IN BUFFER!!
-      for ( imc::block blk: rawblocks_ )
+      for ( imc::block& blk: rawblocks_ )
       {
         if ( blk.get_key().name_ == "NO" ) chnenv.NOuuid_ = blk.get_uuid();
         else if ( blk.get_key().name_ == "NL" ) chnenv.NLuuid_ = blk.get_uuid();
@@ -273,7 +388,7 @@ namespace imc
             // documentation seems to suggest) resulting in all channels missing
             // a CS block except for the very last
             if ( chnenv.CSuuid_.empty() ) {
-              for ( imc::block blkCS: rawblocks_ ) {
+              for ( imc::block& blkCS: rawblocks_ ) {
                 if ( blkCS.get_key().name_ == "CS"
                   && blkCS.get_begin() > (unsigned long int)stol(chnenv.uuid_) ) {
                   chnenv.CSuuid_ = blkCS.get_uuid();
@@ -281,10 +396,14 @@ namespace imc
               }
             }
 
-            // create channel object and add it to the map of channels
-            channels_.insert( std::pair<std::string,imc::channel>
-              (chnenv.CNuuid_,imc::channel(chnenv,&mapblocks_,&buffer_))
-            );
+            // create channel object in place in the map of channels (skipping
+            // any channels not selected right away)
+            if ( this->is_selected(chnenv) )
+            {
+              channels_.emplace( std::piecewise_construct, std::forward_as_tuple(chnenv.CNuuid_),
+                std::forward_as_tuple(chnenv,&mapblocks_,&buffer_,raw_file_,file_id_)
+              );
+            }
 
             // reset channel uuid
             chnenv.CNuuid_.clear();
@@ -308,8 +427,141 @@ namespace imc
       }
     }
 
+    // decode data of all channels unless the cache of channels is enabled, in
+    // which case the buffer is released and channels are decoded on demand
+    // (by reading only their part of the raw-file)
+    void load_channels()
+    {
+      if ( imc::cache::instance().enabled() )
+      {
+        std::vector<unsigned char>().swap(buffer_);
+        return;
+      }
+      if ( deferred_ ) return;
+
+      std::vector<imc::channel*> channels;
+      for ( std::map<std::string,imc::channel>::iterator it = channels_.begin();
+                                                         it != channels_.end(); ++it)
+      {
+        channels.push_back(&(it->second));
+      }
+
+      unsigned int threads = ( threads_ > 0 ) ? threads_ : std::thread::hardware_concurrency();
+      threads = std::min(std::max(threads,1u),(unsigned int)channels.size());
+      if ( threads <= 1 )
+      {
+        for ( imc::channel* chn: channels ) chn->data();
+        return;
+      }
+
+      // channels decode independent (read-only) parts of the buffer, such
+      // that every thread simply picks the next channel not decoded yet
+      std::atomic<unsigned long int> next(0);
+      std::vector<std::exception_ptr> errors(threads);
+      std::vector<std::thread> workers;
+      for ( unsigned int t = 0; t < threads; t++ )
+      {
+        workers.emplace_back([&channels,&next,&errors,t]() {
+          try {
+            for ( unsigned long int c = next++; c < channels.size(); c = next++ )
+            {
+              channels[c]->data();
+            }
+          } catch ( ... ) {
+            errors[t] = std::current_exception();
+          }
+        });
+      }
+      for ( std::thread& wrk: workers ) wrk.join();
+      for ( std::exception_ptr& err: errors )
+      {
+        if ( err ) std::rethrow_exception(err);
+      }
+    }
+
+    // releases buffer (again) once it goes out of scope, if it was restored
+    class buffer_guard
+    {
+      std::vector<unsigned char>* buffer_;
+
+    public:
+
+      buffer_guard(std::vector<unsigned char>* buffer): buffer_(buffer) { }
+      buffer_guard(const buffer_guard&) = delete;
+      buffer_guard& operator=(const buffer_guard&) = delete;
+      ~buffer_guard()
+      {
+        if ( buffer_ != nullptr ) std::vector<unsigned char>().swap(*buffer_);
+      }
+    };
+
+    // restore buffer after it was released in favour of the cache of channels
+    // for the lifetime of the returned guard only
+    buffer_guard require_buffer()
+    {
+      if ( buffer_.empty() && !raw_file_.empty() )
+      {
+        if ( imc::get_file_identity(raw_file_) != file_id_ )
+        {
+          throw std::runtime_error(std::string("raw-file was modified after parsing: ") + raw_file_);
+        }
+        this->fill_buffer();
+        return buffer_guard(&buffer_);
+      }
+      return buffer_guard(nullptr);
+    }
+
+    // get values of all parameters of block
+    std::vector<std::string> get_parameter_values(imc::block& blk)
+    {
+      std::vector<std::string> values;
+      for ( imc::parameter& prm: blk.get_parameters() )
+      {
+        values.push_back(blk.get_parameter(prm));
+      }
+      return values;
+    }
+
+    // right-align value to (previous) width of parameter
+    std::string pad_value(std::string value, unsigned long int width)
+    {
+      if ( value.size() < width ) value.insert(0,width-value.size(),' ');
+      return value;
+    }
+
+    // compose block from values of its parameters (recomputing its length)
+    std::string compose_block(std::string key, std::vector<std::string>& values)
+    {
+      std::string content;
+      for ( unsigned long int p = 2; p < values.size(); p++ )
+      {
+        content += values[p] + ( p+1 < values.size() ? std::string(",") : std::string("") );
+      }
+      std::string length = pad_value(std::to_string(content.size()),(unsigned long int)values[1].size());
+      return std::string("|") + key + std::string(",") + values[0] + std::string(",")
+           + length + std::string(",") + content + std::string(";");
+    }
+
+    // write range of buffer to stream (filling any bytes beyond its end with zeros)
+    void write_buffer(std::ofstream& fout, unsigned long int begin, unsigned long int size)
+    {
+      unsigned long int avail = 0;
+      if ( begin < buffer_.size() )
+      {
+        avail = std::min(size,(unsigned long int)buffer_.size()-begin);
+        fout.write(reinterpret_cast<const char*>(buffer_.data()+begin),(std::streamsize)avail);
+      }
+      if ( avail < size ) fout<<std::string(size-avail,'\0');
+    }
+
   public:
 
+    // get (path of) raw-file
+    std::string& file()
+    {
+      return raw_file_;
+    }
+
     // provide buffer size
     unsigned long int buffer_size()
     {
@@ -347,12 +599,31 @@ namespace imc
       return chns;
     }
 
-    // get particular channel including data by its uuid
-    imc::channel get_channel(std::string uuid)
+    // get number of bytes occupied by decoded data retained by all channels
+    unsigned long long int decoded_size()
     {
-      if ( channels_.count(uuid) )
+      unsigned long long int size = 0;
+      for ( std::map<std::string,imc::channel>::iterator it = channels_.begin();
+                                                         it != channels_.end(); ++it)
       {
-        return channels_.at(uuid);
+        size += it->second.decoded_size();
+      }
+      return size;
+    }
+
+    // get map of channels (by their uuid)
+    std::map<std::string,imc::channel>& channels()
+    {
+      return channels_;
+    }
+
+    // get (reference to) particular channel including data by its uuid
+    imc::channel& get_channel(std::string uuid)
+    {
+      std::map<std::string,imc::channel>::iterator it = channels_.find(uuid);
+      if ( it != channels_.end() )
+      {
+        return it->second;
       }
       else
       {
@@ -364,7 +635,7 @@ namespace imc
     std::vector<imc::block> list_blocks(const imc::key &mykey)
     {
       std::vector<imc::block> myblocks;
-      for ( imc::block blk: this->rawblocks_ )
+      for ( imc::block& blk: this->rawblocks_ )
       {
         if ( blk.get_key() == mykey ) myblocks.push_back(blk);
       }
@@ -380,8 +651,10 @@ namespace imc
     // list all channels
     std::vector<std::string> list_channels()
     {
+      buffer_guard guard = this->require_buffer();
+
       std::vector<std::string> channels;
-      for ( imc::block blk: this->rawblocks_ )
+      for ( imc::block& blk: this->rawblocks_ )
       {
         if ( blk.get_key() == imc::get_key(true,"CN") )
         {
@@ -416,6 +689,121 @@ namespace imc
       }
     }
 
+    // write raw-file comprising the present (i.e. selected) channels only by
+    // copying their blocks and data straight from the buffer, with only the
+    // CS blocks and the references of Cb blocks to them being rewritten
+    void write_raw(std::string outputfile)
+    {
+      if ( channels_.empty() )
+      {
+        throw std::runtime_error(std::string("no (selected) channels to be written to raw-file: ") + outputfile);
+      }
+
+      buffer_guard guard = this->require_buffer();
+
+      // collect blocks affiliated to channels and components referring to CS blocks
+      std::set<std::string> blockuuids;
+      std::map<std::string,std::vector<std::string>> csbuffers;
+      for ( std::map<std::string,imc::channel>::iterator it = channels_.begin();
+                                                         it != channels_.end(); ++it)
+      {
+        imc::channel_env& env = it->second.chnenv_;
+        for ( const std::string& uuid: { env.NOuuid_, env.NLuuid_, env.CBuuid_, env.CGuuid_,
+                                         env.CIuuid_, env.CTuuid_, env.CNuuid_, env.CDuuid_,
+                                         env.NTuuid_ } )
+        {
+          if ( !uuid.empty() ) blockuuids.insert(uuid);
+        }
+        for ( imc::component_env* comp: { &env.compenv1_, &env.compenv2_ } )
+        {
+          for ( const std::string& uuid: { comp->CCuuid_, comp->CPuuid_, comp->CDuuid_,
+                                           comp->NTuuid_, comp->Cbuuid_, comp->CRuuid_ } )
+          {
+            if ( !uuid.empty() ) blockuuids.insert(uuid);
+          }
+          if ( !comp->Cbuuid_.empty() && !env.CSuuid_.empty() )
+          {
+            csbuffers[env.CSuuid_].push_back(comp->Cbuuid_);
+          }
+        }
+      }
+
+      // number remaining CS blocks and arrange data of their components
+      // (given by Cb blocks in order) consecutively in every CS block
+      std::map<std::string,unsigned long int> csindex, cbindex, cboffset;
+      std::map<std::string,std::vector<std::pair<unsigned long int,unsigned long int>>> csranges;
+      for ( imc::block& blk: rawblocks_ )
+      {
+        if ( blk.get_key().name_ != "CS" || csbuffers.count(blk.get_uuid()) == 0 ) continue;
+        if ( blk.get_parameters().size() < 4 )
+        {
+          throw std::runtime_error("CS block is invalid and features to few parameters");
+        }
+
+        std::vector<std::string>& cbs = csbuffers.at(blk.get_uuid());
+        std::sort(cbs.begin(),cbs.end(),[](const std::string& a, const std::string& b) {
+          return std::stoul(a) < std::stoul(b);
+        });
+        cbs.erase(std::unique(cbs.begin(),cbs.end()),cbs.end());
+
+        unsigned long int index = (unsigned long int)csindex.size() + 1;
+        csindex[blk.get_uuid()] = index;
+        unsigned long int datastrt = blk.get_parameters()[3].begin() + 1, offset = 0;
+        for ( std::string& cb: cbs )
+        {
+          imc::buffer Cb;
+          Cb.parse(&buffer_, mapblocks_.at(cb).get_parameters());
+          cbindex[cb] = index;
+          cboffset[cb] = offset;
+          csranges[blk.get_uuid()].push_back(std::pair<unsigned long int,unsigned long int>
+            (datastrt+Cb.offset_buffer_,Cb.number_bytes_));
+          offset += Cb.number_bytes_;
+        }
+      }
+
+      std::ofstream fout(outputfile,std::ofstream::binary);
+      if ( !fout.good() )
+      {
+        throw std::runtime_error(std::string("failed to open output file: ") + outputfile);
+      }
+
+      for ( imc::block& blk: rawblocks_ )
+      {
+        std::string key = blk.get_key().name_;
+        if ( key == "CS" )
+        {
+          if ( csindex.count(blk.get_uuid()) == 0 ) continue;
+
+          // compose CS block of selected data only
+          std::string index = std::to_string(csindex.at(blk.get_uuid()));
+          unsigned long int size = (unsigned long int)index.size() + 1;
+          for ( auto& rng: csranges.at(blk.get_uuid()) ) size += rng.second;
+          fout<<"|CS,"<<blk.get_parameter(blk.get_parameters()[0])<<","<<size<<","<<index<<",";
+          for ( auto& rng: csranges.at(blk.get_uuid()) ) write_buffer(fout,rng.first,rng.second);
+          fout<<";";
+        }
+        else if ( key == "Cb" && cboffset.count(blk.get_uuid()) == 1 )
+        {
+          // refer to new index of CS block and offset in its data
+          std::vector<std::string> values = get_parameter_values(blk);
+          if ( values.size() < 13 ) throw std::runtime_error("invalid number of parameters in Cb");
+          values[5] = pad_value(std::to_string(cbindex.at(blk.get_uuid())),(unsigned long int)values[5].size());
+          values[6] = pad_value(std::to_string(cboffset.at(blk.get_uuid())),(unsigned long int)values[6].size());
+          fout<<compose_block(key,values);
+        }
+        else if ( key == "CF" || key == "CK" || blockuuids.count(blk.get_uuid()) == 1 )
+        {
+          write_buffer(fout,blk.get_begin(),blk.get_end()-blk.get_begin()+1);
+        }
+      }
+
+      if ( !fout.good() )
+      {
+        throw std::runtime_error(std::string("failed to write output file: ") + outputfile);
+      }
+      fout.close();
+    }
+
     // print all channels into given directory
     void print_channels(std::string output, const char sep)
     {
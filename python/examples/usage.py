@@ -11,7 +11,7 @@ except RuntimeError as e :
 
 # obtain list of channels as list of dictionaries (without data)
 channels = imcraw.get_channels(False)
-print(json.dumps(channels,indent=4, sort_keys=False))
+print(json.dumps(channels,indent=4, sort_keys=False, default=str))
 
 # obtain data of first channel (with data)
 channelsdata = imcraw.get_channels(True)
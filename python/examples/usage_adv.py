@@ -21,7 +21,7 @@ for fl in rawlist1:
 
     # obtain list of channels as list of dictionaries (without data)
     channels = imcraw.get_channels(False)
-    print(json.dumps(channels,indent=4, sort_keys=False))
+    print(json.dumps(channels,indent=4, sort_keys=False, default=str))
 
     # print the channels into a specific directory
     imcraw.print_channels(b"./",ord(','))
@@ -2,7 +2,7 @@
 import imctermite
 import json
 import os
-import datetime
+import numpy
 
 # declare and initialize instance of "imctermite" by passing a raw-file
 try :
@@ -12,10 +12,10 @@ except RuntimeError as e :
 
 # obtain list of channels as list of dictionaries (without data)
 channels = imcraw.get_channels(False)
-print(json.dumps(channels,indent=4, sort_keys=False))
+print(json.dumps(channels,indent=4, sort_keys=False, default=str))
 
-# obtain all channels (including full data)
-channelsdata = imcraw.get_channels(True)
+# obtain all channels (including full data and absolute timestamps)
+channelsdata = imcraw.get_channels(True,True)
 
 # everything that follows is an example that specifically makes use only of
 # the first (index = 0) channel ...
@@ -29,9 +29,10 @@ if len(channelsdata) > 0 :
     print("xdata: " + str(len(chnxdata)))
     print("ydata: " + str(len(chnydata)))
 
-    # extract trigger-time
-    trigtim = datetime.datetime.fromisoformat(channels[idx]["trigger-time"])
+    # extract trigger-time and absolute timestamps
+    trigtim = channels[idx]["trigger-time"]
     print(trigtim)
+    chnxtime = numpy.asarray(channelsdata[idx]['xtime'])
 
     # file output of data with absolute timestamp in 1st column
     filname = os.path.join("./",channelsdata[idx]['name']+".csv")
@@ -42,9 +43,9 @@ if len(channelsdata) > 0 :
                   + ","
                   + str(channelsdata[idx]['yname']) + '[' + str(channelsdata[idx]['yunit']) + "]"
                   + "\n" )
-        # add data (introduce time shift according to trigger-time)
+        # add data (with absolute timestamps according to trigger-time)
         for row in range(0,len(chnxdata)) :
-            fout.write( str( (trigtim + datetime.timedelta(seconds=chnxdata[row])).isoformat() )
+            fout.write( str(chnxtime[row])
                       + ","
                       + str( chnydata[row])
                       + "\n" )
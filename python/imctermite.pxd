@@ -1,8 +1,105 @@
-
 # use some C++ STL libraries
 from libcpp.string cimport string
 from libcpp.vector cimport vector
+from libcpp.map cimport map
+from libcpp.memory cimport shared_ptr
 from libcpp cimport bool
+from libc.time cimport time_t
+
+cdef extern from "lib/imc_raw.hpp" namespace "imc":
+
+  cdef cppclass cppdatatype "imc::datatype":
+
+    # obtain number as double
+    double as_double() const
+
+cdef extern from "lib/imc_raw.hpp" namespace "imc":
+
+  cdef cppclass cppchanneldata "imc::channel_data":
+
+    # decoded samples
+    vector[cppdatatype] xdata_, ydata_
+
+  cdef cppclass cppcachestats "imc::cache_stats":
+
+    # budget and occupied number of bytes
+    unsigned long long budget_, size_
+
+    # number of entries, hits, misses and evictions
+    unsigned long int entries_, hits_, misses_, evictions_
+
+  cdef cppclass cppcache "imc::cache":
+
+    # get process-wide instance
+    @staticmethod
+    cppcache& instance()
+
+    # set budget of bytes, remove all entries and get statistics
+    void set_budget(unsigned long long budget)
+    void clear()
+    cppcachestats get_stats()
+
+cdef extern from "lib/imc_raw.hpp" namespace "imc":
+
+  cdef cppclass cppchannel "imc::channel":
+
+    # metadata
+    string uuid_
+    string name_, comment_
+    string origin_, origin_comment_, text_
+    double trigger_time_frac_secs_
+    string language_code_, codepage_
+    string yname_, yunit_
+    string xname_, xunit_
+    double xstepwidth_, xstart_
+    int dimension_
+    int ysignbits_
+    unsigned long int ybuffer_size_
+    int xdatatp_, ydatatp_
+    double xfactor_, yfactor_
+    double xoffset_, yoffset_
+    unsigned long int group_index_
+    string group_name_, group_comment_
+
+    # number of samples and (decoded) data
+    unsigned long int num_values_
+    shared_ptr[const cppchanneldata] data() except +
+
+    # decode ordinate/abscissa (applying factor and offset) into given memory
+    void decode_values(double* values, bool xdata) except +
+
+    # copy raw counts (in native numeric type) of ordinate/abscissa
+    void copy_raw_counts(unsigned char* counts, unsigned long int size, bool xdata) except +
+
+    # get (absolute) trigger-time in seconds since epoch
+    time_t get_trigger_time(bool absolute)
+
+    # get absolute time of samples in nanoseconds since epoch
+    long long get_xstart_ns() except +
+    long long get_xstep_ns() except +
+    vector[long long] get_xtime_ns() except +
+
+cdef extern from "lib/imc_raw.hpp" namespace "imc":
+
+  cdef cppclass cpptimegrid "imc::timegrid":
+
+    # equidistant time grid (in nanoseconds since epoch)
+    long long start_ns_, step_ns_
+    unsigned long int length_
+
+  # determine common time grid of channels and align channels onto it
+  cpptimegrid cppget_timegrid "imc::get_timegrid"(vector[cppchannel*]& channels, long long step_ns) except +
+  void cppalign_channels "imc::align_channels"(vector[cppchannel*]& channels, cpptimegrid& grid,
+                                                string method, double* data) except + nogil
+
+cdef extern from "lib/imc_raw.hpp" namespace "imc":
+
+  cdef cppclass cppselection "imc::selection":
+
+    # selection of channels by uuids/names and patterns
+    cppselection() except +
+    cppselection(vector[string] channels, vector[string] patterns) except +
+    bool matches(const string& uuid, const string& name)
 
 cdef extern from "lib/imc_raw.hpp" namespace "imc":
 
@@ -12,12 +109,30 @@ cdef extern from "lib/imc_raw.hpp" namespace "imc":
     cppimctermite() except +
     cppimctermite(string rawfile) except +
 
-    # provide raw file
+    # provide raw file (and selection of channels by uuids/names and patterns)
     void set_file(string rawfile) except +
+    void set_file(string rawfile, vector[string] channels) except +
+    void set_file(string rawfile, vector[string] channels, vector[string] patterns) except +
+
+    # set number of threads decoding channels (or defer decoding)
+    void set_threads(unsigned int threads)
+    void set_deferred(bool deferred)
+
+    # write raw file comprising (selected) channels only
+    void write_raw(string outputfile) except +
+
+    # get (path of) raw file
+    string& file()
 
     # get JSON list of channels
     vector[string] get_channels(bool json, bool data) except +
 
+    # get map of channels (by their uuid)
+    map[string,cppchannel]& channels()
+
+    # get number of bytes occupied by decoded data retained by channels
+    unsigned long long decoded_size()
+
     # print single channel/all channels
     void print_channel(string channeluuid, string outputdir, char delimiter) except +
     void print_channels(string outputdir, char delimiter) except +
@@ -1,39 +1,313 @@
 # distutils: language = c++
 # cython: language_level = 3
 
-from imctermite cimport cppimctermite
+from imctermite cimport cppimctermite, cppchannel, cppdatatype, cppchanneldata
+from imctermite cimport cppcache, cppcachestats
+from imctermite cimport cpptimegrid, cppget_timegrid, cppalign_channels, cppselection
+from libcpp.string cimport string
+from libcpp.vector cimport vector
+from libcpp.map cimport map
+from libcpp.memory cimport shared_ptr
+from libc.stdint cimport int64_t
+from libc.string cimport memcpy
+from cython.operator cimport dereference as deref, preincrement as inc
 
-import json as jn
-import decimal
+import datetime
 import platform
+import os
+import re
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+# numpy is only required for array output
+try :
+    import numpy
+except ImportError :
+    numpy = None
+
+# reference for trigger-times given in seconds since epoch
+epoch = datetime.datetime(1970,1,1)
 
 # auxiliary function for codepage conversion
-def get_codepage(chn) :
-    if platform == 'Windows' :
-        chndec = jn.loads(chn.decode(errors="ignore"))
-        chncdp = chndec["codepage"]
-        return 'utf-8' if chncdp is None else chncdp
+def get_codepage(codepage) :
+    if platform.system() == 'Windows' and codepage :
+        return 'cp' + codepage
     else :
         return 'utf-8'
 
+# convert seconds since epoch (and fractional seconds) to datetime
+def get_datetime(seconds, frac_secs) :
+    return epoch + datetime.timedelta(seconds=seconds,microseconds=round(frac_secs*1.e6))
+
+# make sure numpy is available for array output
+def require_numpy() :
+    if numpy is None :
+        raise ImportError("numpy is required for array output of imctermite")
+    return numpy
+
+# equidistant abscissa of absolute timestamps given by start and step (in
+# nanoseconds since epoch), which is materialized as datetime64[ns] array
+# by numpy.asarray() only
+class timeaxis :
+
+    __slots__ = ('start','step','length')
+
+    def __init__(self, start, step, length) :
+        self.start = start
+        self.step = step
+        self.length = length
+
+    def __len__(self) :
+        return self.length
+
+    def __getitem__(self, idx) :
+        rng = range(self.length)[idx]
+        if isinstance(idx,slice) :
+            return timeaxis(self.start+rng.start*self.step,rng.step*self.step,len(rng))
+        return require_numpy().datetime64(self.start+rng*self.step,'ns')
+
+    def __array__(self, dtype=None, copy=None) :
+        np = require_numpy()
+        xtime = np.arange(self.length,dtype=np.int64)*self.step + self.start
+        xtime = xtime.view('datetime64[ns]')
+        return xtime if dtype is None else xtime.astype(dtype)
+
+    def __repr__(self) :
+        return ("timeaxis(start=" + str(self.start) + ", step=" + str(self.step)
+                + ", length=" + str(self.length) + ")")
+
+# collect selection of channels given by (list of) uuids and names (str or
+# bytes, matched literally) and/or compiled regular expressions matching the
+# names (evaluated in ECMAScript syntax, such that they must not feature any
+# flags), returned as separate lists of literals and patterns
+cdef tuple get_selection(channels) :
+  names, patterns = [], []
+  if channels is None :
+    return names, patterns
+  if isinstance(channels,(str,bytes,re.Pattern)) :
+    channels = [channels]
+  for sel in channels :
+    if isinstance(sel,re.Pattern) :
+      if sel.flags & ~re.UNICODE :
+        raise ValueError("flags of regular expressions selecting channels are not supported: "
+                         + str(sel))
+      sel = sel.pattern
+      patterns.append(sel.encode() if isinstance(sel,str) else sel)
+    else :
+      names.append(sel.encode() if isinstance(sel,str) else sel)
+  return names, patterns
+
+# decode any text of channel
+cdef str decode_text(string text, str encoding) :
+  return text.decode(encoding,"ignore")
+
+# collect numeric data in list
+cdef list get_data(const vector[cppdatatype]& data) :
+  cdef size_t i
+  return [data[i].as_double() for i in range(data.size())]
+
+# get absolute timestamps of abscissa (None if abscissa is not a time axis)
+cdef object get_xtime(cppchannel& chn) :
+  cdef vector[long long] xtime
+  cdef int64_t[::1] xtimeview
+  try :
+    if chn.dimension_ == 1 :
+      return timeaxis(chn.get_xstart_ns(),chn.get_xstep_ns(),chn.num_values_)
+    xtime = chn.get_xtime_ns()
+  except ValueError :
+    # abscissa unit is not a unit of time (given explicitly by XY channels)
+    return None
+  np = require_numpy()
+  xtimearr = np.empty(xtime.size(),dtype=np.int64)
+  if xtime.size() > 0 :
+    xtimeview = xtimearr
+    memcpy(&xtimeview[0],xtime.data(),xtime.size()*sizeof(long long))
+  return xtimearr.view('datetime64[ns]')
+
+# numpy dtypes of (little-endian) numeric types of raw counts
+raw_count_dtypes = {
+  1: 'u1',   # unsigned byte
+  2: 'i1',   # signed byte
+  3: '<u2',  # unsigned short
+  4: '<i2',  # signed short
+  5: '<u4',  # unsigned long
+  6: '<i4',  # signed long
+  7: '<f4',  # float
+  8: '<f8',  # double
+  11: '<u2', # two-byte-word digital
+  13: '<u8'  # six-byte unsigned long (widened to eight bytes)
+}
+
+# get raw counts of ordinate (or abscissa) as numpy array in native numeric type
+cdef object get_raw_counts(cppchannel& chn, bool xdata) :
+  cdef unsigned char[::1] countsview
+  np = require_numpy()
+  datatp = chn.xdatatp_ if xdata else chn.ydatatp_
+  if datatp not in raw_count_dtypes :
+    raise ValueError("raw counts of numeric type " + str(datatp) + " are not supported")
+  if datatp == 13 :
+    # copy six bytes per sample into lower bytes of (zeroed) eight bytes
+    counts = np.zeros(chn.num_values_,dtype=raw_count_dtypes[datatp])
+    packed = np.empty((chn.num_values_,6),dtype=np.uint8)
+  else :
+    counts = np.empty(chn.num_values_,dtype=raw_count_dtypes[datatp])
+    packed = counts.view(np.uint8)
+  if packed.nbytes > 0 :
+    countsview = packed.reshape(-1)
+    chn.copy_raw_counts(&countsview[0],packed.nbytes,xdata)
+    if datatp == 13 :
+      counts.view(np.uint8).reshape(-1,8)[:,:6] = packed
+  return counts
+
+# get (effective) factor and offset to be applied to raw counts
+cdef dict get_scale(double factor, double offset) :
+  return {'factor': factor if factor != 0. else 1., 'offset': offset}
+
+# create block of shared memory persisting beyond this process until it is
+# unlinked by attach_channels(), i.e. not tracked by this process' resource
+# tracker (which would unlink it at exit)
+cdef object create_shared_block(size_t size) :
+  try :
+    return shared_memory.SharedMemory(create=True,size=size,track=False)
+  except TypeError :
+    # python < 3.13 features no argument 'track' and requires to unregister
+    # the block by its private (prefixed) name instead
+    shm = shared_memory.SharedMemory(create=True,size=size)
+    resource_tracker.unregister(shm._name,'shared_memory')
+    return shm
+
+# decode data of channel straight into new block of shared memory as array of
+# shape (2,N) featuring xdata and ydata as rows, or (1,N) featuring ydata only
+# for equidistant channels (returning descriptor of block)
+cdef dict share_data(cppchannel& chn) :
+  cdef size_t num_values = chn.num_values_
+  cdef size_t rows = 2 if chn.dimension_ == 2 else 1
+  cdef double[:,::1] dataview
+  if os.name != 'posix' :
+    # blocks are destroyed along with their last handle on other platforms,
+    # i.e. before they could be attached to in any other process
+    raise NotImplementedError("sharing channels via shared memory requires a POSIX platform")
+  np = require_numpy()
+  shape = (rows,num_values)
+  shm = create_shared_block(max(1,rows*num_values*sizeof(double)))
+  try :
+    data = np.ndarray(shape,dtype=np.float64,buffer=shm.buf)
+    if num_values > 0 :
+      dataview = data
+      chn.decode_values(&dataview[rows-1,0],False)
+      if rows == 2 :
+        chn.decode_values(&dataview[0,0],True)
+      dataview = None
+    del data
+  except :
+    shm.close()
+    shm.unlink()
+    raise
+  shm.close()
+  return {'name': shm.name, 'dtype': 'float64', 'shape': shape}
+
+# build dictionary of channel metadata (and data)
+cdef dict get_channel_dict(cppchannel& chn, bool include_data, bool include_time,
+                          bool raw_counts=False) :
+  cdef shared_ptr[const cppchanneldata] chndata
+  enc = get_codepage(decode_text(chn.codepage_,'utf-8'))
+  chninfo = {
+    'uuid': decode_text(chn.uuid_,'utf-8'),
+    'name': decode_text(chn.name_,enc),
+    'comment': decode_text(chn.comment_,enc),
+    'origin': decode_text(chn.origin_,enc),
+    'origin-comment': decode_text(chn.origin_comment_,enc),
+    'description': decode_text(chn.text_,enc),
+    'trigger-time-nt': get_datetime(chn.get_trigger_time(False),chn.trigger_time_frac_secs_),
+    'trigger-time': get_datetime(chn.get_trigger_time(True),chn.trigger_time_frac_secs_),
+    'language-code': decode_text(chn.language_code_,enc),
+    'codepage': decode_text(chn.codepage_,enc),
+    'yname': decode_text(chn.yname_,enc),
+    'yunit': decode_text(chn.yunit_,enc),
+    'significantbits': chn.ysignbits_,
+    'buffer-size': chn.ybuffer_size_,
+    'xname': decode_text(chn.xname_,enc),
+    'xunit': decode_text(chn.xunit_,enc),
+    'xstepwidth': chn.xstepwidth_,
+    'xoffset': chn.xstart_,
+    'group': {
+      'index': chn.group_index_,
+      'name': decode_text(chn.group_name_,enc),
+      'comment': decode_text(chn.group_comment_,enc)
+    }
+  }
+  if include_data and raw_counts :
+    chninfo['ydata'] = get_raw_counts(chn,False)
+    chninfo['yscale'] = get_scale(chn.yfactor_,chn.yoffset_)
+    if chn.dimension_ == 2 :
+      chninfo['xdata'] = get_raw_counts(chn,True)
+      chninfo['xscale'] = get_scale(chn.xfactor_,chn.xoffset_)
+    else :
+      chninfo['xdata'] = None
+  elif include_data :
+    chndata = chn.data()
+    chninfo['ydata'] = get_data(deref(chndata).ydata_)
+    chninfo['xdata'] = get_data(deref(chndata).xdata_)
+  if include_time :
+    chninfo['xtime'] = get_xtime(chn)
+  return chninfo
+
 cdef class imctermite:
 
   # C++ instance of class => stack allocated (requires nullary constructor!)
   cdef cppimctermite cppimc
 
-  # constructor
-  def __cinit__(self, string rawfile):
-    self.cppimc = cppimctermite(rawfile)
+  # constructor (processing selected channels only, if any channels are given,
+  # and decoding them by given number of threads, with 0 using all cores, or
+  # deferring decoding until their data is requested, e.g. to obtain raw
+  # counts only without ever decoding them)
+  def __cinit__(self, string rawfile, channels=None, unsigned int threads=1,
+                bool deferred=False):
+    self.cppimc.set_threads(threads)
+    self.cppimc.set_deferred(deferred)
+    names, patterns = get_selection(channels)
+    self.cppimc.set_file(rawfile,names,patterns)
 
   # provide raw file
-  def submit_file(self,string rawfile):
-    self.cppimc.set_file(rawfile)
+  def submit_file(self,string rawfile, channels=None, threads=None, deferred=None):
+    if threads is not None :
+      self.cppimc.set_threads(threads)
+    if deferred is not None :
+      self.cppimc.set_deferred(deferred)
+    names, patterns = get_selection(channels)
+    self.cppimc.set_file(rawfile,names,patterns)
 
-  # get JSON list of channels
-  def get_channels(self, bool include_data):
-    chnlst = self.cppimc.get_channels(True,include_data)
-    chnlstjn = [jn.loads(chn.decode(get_codepage(chn),errors="ignore")) for chn in chnlst]
-    return chnlstjn
+  # get number of bytes occupied by decoded data retained by channels
+  def get_decoded_size(self):
+    return self.cppimc.decoded_size()
+
+  # get list of channels (metadata and optionally data as dictionaries)
+  # (with include_time, the abscissa is given as absolute timestamps by 'xtime')
+  # (with raw_counts, data is given as numpy arrays of undecoded samples in their
+  # native numeric type, to be scaled by 'factor' and 'offset' of 'yscale'/'xscale'
+  # on demand, while 'xdata' of equidistant channels is None)
+  def get_channels(self, bool include_data, bool include_time=False, bool raw_counts=False):
+    cdef map[string,cppchannel].iterator it = self.cppimc.channels().begin()
+    chnlst = []
+    while it != self.cppimc.channels().end() :
+      chnlst.append(get_channel_dict(deref(it).second,include_data,include_time,raw_counts))
+      inc(it)
+    return chnlst
+
+  # decode channels into blocks of shared memory (instead of lists) and get
+  # (picklable) list of channels with metadata and descriptor 'shm' of their
+  # block, e.g. to be returned by workers of a multiprocessing pool and
+  # attached to by attach_channels() in the parent process (without retaining
+  # any decoded data in this process if the file is opened deferred)
+  def share_channels(self, bool include_time=False):
+    cdef map[string,cppchannel].iterator it = self.cppimc.channels().begin()
+    chnlst = []
+    while it != self.cppimc.channels().end() :
+      chninfo = get_channel_dict(deref(it).second,False,include_time)
+      chninfo['shm'] = share_data(deref(it).second)
+      chnlst.append(chninfo)
+      inc(it)
+    return chnlst
 
   # print single channel/all channels
   def print_channel(self, string channeluuid, string outputfile, char delimiter):
@@ -43,12 +317,119 @@ cdef class imctermite:
 
   # print table including channels
   def print_table(self, string outputfile):
-    chnlst = self.cppimc.get_channels(True,True)
-    chnlstjn = [jn.loads(chn.decode(errors="ignore")) for chn in chnlst]
+    chnlst = self.get_channels(True)
     with open(outputfile.decode(),'w') as fout:
-      for chn in chnlstjn:
+      for chn in chnlst:
         fout.write('#' +str(chn['xname']).rjust(19)+str(chn['yname']).rjust(20)+'\n')
         fout.write('#'+str(chn['xunit']).rjust(19)+str(chn['yunit']).rjust(20)+'\n')
         for n in range(0,len(chn['ydata'])):
           fout.write(str(chn['xdata'][n]).rjust(20)+
                      str(chn['ydata'][n]).rjust(20)+'\n')
+
+# attach to channels shared by share_channels() (in any process), providing
+# xdata and ydata as zero-copy numpy views of their blocks of shared memory,
+# which are unlinked right away and released once the views are discarded
+# (with xdata of equidistant channels being None, as given by 'xoffset' and
+# 'xstepwidth')
+def attach_channels(channels):
+  np = require_numpy()
+  chnlst = []
+  for chn in channels :
+    chninfo = dict(chn)
+    desc = chninfo.pop('shm')
+    shm = shared_memory.SharedMemory(name=desc['name'])
+    data = np.ndarray(tuple(desc['shape']),dtype=desc['dtype'],buffer=shm.buf)
+    weakref.finalize(data,shm.close).atexit = False
+    shm.unlink()
+    chninfo['xdata'] = data[0] if data.shape[0] == 2 else None
+    chninfo['ydata'] = data[-1]
+    chnlst.append(chninfo)
+  return chnlst
+
+# write raw file comprising selected channels of given raw file only (with the
+# blocks being copied as they are without decoding any channels)
+def write_raw(string rawfile, string outputfile, channels=None):
+  cdef cppimctermite cppimc
+  cppimc.set_deferred(True)
+  names, patterns = get_selection(channels)
+  cppimc.set_file(rawfile,names,patterns)
+  cppimc.write_raw(outputfile)
+
+# limit process-wide cache of decoded channels to a budget of bytes, with the
+# least recently used channels being evicted (a budget of 0 disables the cache)
+# (files parsed while the cache is enabled release their buffer and decode
+# channels on demand only)
+def set_cache_budget(unsigned long long nbytes):
+  cppcache.instance().set_budget(nbytes)
+
+# get statistics of cache of decoded channels
+def get_cache_stats():
+  cdef cppcachestats stats = cppcache.instance().get_stats()
+  return {
+    'budget': stats.budget_,
+    'size': stats.size_,
+    'entries': stats.entries_,
+    'hits': stats.hits_,
+    'misses': stats.misses_,
+    'evictions': stats.evictions_
+  }
+
+# remove all decoded channels from cache (and reset its statistics)
+def clear_cache():
+  cppcache.instance().clear()
+
+# align (selected) channels of one or more files onto a common, equidistant time
+# grid (with channels being selected like in the constructor and with step width
+# in seconds, by default the finest one of all channels)
+# by means of interpolation method 'nearest', 'linear' or 'hold' (refusing
+# to allocate arrays exceeding max_bytes, e.g. for files years apart)
+def align_channels(imcs, channels=None, step=None, str method='linear',
+                   unsigned long long max_bytes=1<<30):
+  cdef imctermite imc
+  cdef map[string,cppchannel].iterator it
+  cdef vector[cppchannel*] chns
+  cdef cppselection selection
+  cdef cpptimegrid grid
+  cdef long long step_ns = 0
+  cdef double[:,::1] dataview
+  cdef string cppmethod = method.encode()
+
+  np = require_numpy()
+  if isinstance(imcs,imctermite) :
+    imcs = [imcs]
+  names, patterns = get_selection(channels)
+  selection = cppselection(names,patterns)
+  if step is not None :
+    step_ns = round(step*1.e9)
+    if step_ns <= 0 :
+      raise ValueError("step width must be positive (and at least 1ns): " + str(step))
+
+  # collect channels and their metadata
+  columns = []
+  for imc in imcs :
+    it = imc.cppimc.channels().begin()
+    while it != imc.cppimc.channels().end() :
+      if selection.matches(deref(it).second.uuid_,deref(it).second.group_name_) :
+        chninfo = get_channel_dict(deref(it).second,False,False)
+        chninfo['file'] = decode_text(imc.cppimc.file(),'utf-8')
+        columns.append(chninfo)
+        chns.push_back(&deref(it).second)
+      inc(it)
+
+  # interpolate all channels onto common time grid in a single array
+  grid = cppget_timegrid(chns,step_ns)
+  if grid.length_ > max_bytes // max(1,chns.size()*sizeof(double)) :
+    raise ValueError("aligned channels of " + str(grid.length_) + " rows and " + str(chns.size())
+                     + " columns exceed max_bytes=" + str(max_bytes)
+                     + " (choose a larger step or fewer channels, or raise max_bytes)")
+  data = np.empty((grid.length_,chns.size()),dtype=np.float64)
+  if data.size > 0 :
+    dataview = data
+    with nogil :
+      cppalign_channels(chns,grid,cppmethod,&dataview[0,0])
+
+  return {
+    'xtime': timeaxis(grid.start_ns_,grid.step_ns_,grid.length_),
+    'data': data,
+    'columns': columns
+  }
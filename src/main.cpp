@@ -79,6 +79,66 @@ optkeys parse_args(int argc, char* argv[], bool list_args = false)
         i = i + 1;
       }
     }
+    else if ( std::string(argv[i]) == std::string("--write")
+           || std::string(argv[i]) == std::string("-w") )
+    {
+      if ( i+1 == argc || argv[i+1][0] == '-' )
+      {
+        std::cerr<<"invalid or missing --write argument\n";
+        prsdkeys.insert(std::pair<std::string,std::string>("invalid","write"));
+      }
+      else
+      {
+        prsdkeys.insert(std::pair<std::string,std::string>("write",argv[i+1]));
+        i = i + 1;
+      }
+    }
+    else if ( std::string(argv[i]) == std::string("--channel")
+           || std::string(argv[i]) == std::string("-n") )
+    {
+      if ( i+1 == argc )
+      {
+        std::cerr<<"invalid or missing --channel argument\n";
+        prsdkeys.insert(std::pair<std::string,std::string>("invalid","channel"));
+      }
+      else
+      {
+        // option may be repeated to select multiple channels (separated by newlines)
+        if ( prsdkeys.count("channel") == 1 ) prsdkeys.at("channel") += std::string("\n") + argv[i+1];
+        else prsdkeys.insert(std::pair<std::string,std::string>("channel",argv[i+1]));
+        i = i + 1;
+      }
+    }
+    else if ( std::string(argv[i]) == std::string("--channel-regex")
+           || std::string(argv[i]) == std::string("-r") )
+    {
+      if ( i+1 == argc )
+      {
+        std::cerr<<"invalid or missing --channel-regex argument\n";
+        prsdkeys.insert(std::pair<std::string,std::string>("invalid","channelregex"));
+      }
+      else
+      {
+        // option may be repeated to select multiple channels (separated by newlines)
+        if ( prsdkeys.count("channelregex") == 1 ) prsdkeys.at("channelregex") += std::string("\n") + argv[i+1];
+        else prsdkeys.insert(std::pair<std::string,std::string>("channelregex",argv[i+1]));
+        i = i + 1;
+      }
+    }
+    else if ( std::string(argv[i]) == std::string("--threads")
+           || std::string(argv[i]) == std::string("-j") )
+    {
+      if ( i+1 == argc || argv[i+1][0] == '-' )
+      {
+        std::cerr<<"invalid or missing --threads argument\n";
+        prsdkeys.insert(std::pair<std::string,std::string>("invalid","threads"));
+      }
+      else
+      {
+        prsdkeys.insert(std::pair<std::string,std::string>("threads",argv[i+1]));
+        i = i + 1;
+      }
+    }
     else if ( std::string(argv[i]) == std::string("--delimiter")
            || std::string(argv[i]) == std::string("-s") )
     {
@@ -148,7 +208,11 @@ void show_usage()
            <<" -c, --listchannels      list channels\n"
            <<" -b, --listblocks        list IMC key-blocks\n"
            <<" -d, --output            output directory to print channels\n"
+           <<" -w, --write             write raw-file comprising (selected) channels only\n"
+           <<" -n, --channel           select channel by uuid or name (repeatable)\n"
+           <<" -r, --channel-regex     select channels by regex matching name (repeatable)\n"
            <<" -s, --delimiter         csv delimiter/separator char for output\n"
+           <<" -j, --threads           number of threads decoding channels (0 = all cores)\n"
            <<" -h, --help              show this help message \n"
            <<" -v, --version           display version\n"
            <<"\n"
@@ -200,10 +264,39 @@ int main(int argc, char* argv[])
       return 1;
     }
 
+    // collect selection of channels (by uuids/names and regular expressions)
+    std::vector<std::string> channels, patterns;
+    if ( cfgopts.count("channel") == 1 )
+    {
+      std::stringstream ss(cfgopts.at("channel"));
+      std::string sel;
+      while ( std::getline(ss,sel,'\n') ) channels.push_back(sel);
+    }
+    if ( cfgopts.count("channelregex") == 1 )
+    {
+      std::stringstream ss(cfgopts.at("channelregex"));
+      std::string sel;
+      while ( std::getline(ss,sel,'\n') ) patterns.push_back(sel);
+    }
+
     // initialize "imc::raw" instance
     imc::raw imcraw;
+    if ( cfgopts.count("threads") == 1 )
+    {
+      try {
+        imcraw.set_threads((unsigned int)std::stoul(cfgopts.at("threads")));
+      } catch (const std::exception& ) {
+        std::cerr<<"invalid number of threads: "<<cfgopts.at("threads")<<"\n";
+        return 1;
+      }
+    }
+    // skip decoding if channels are only written to raw-file
+    if ( cfgopts.count("listchannels") == 0 && cfgopts.count("output") == 0 )
+    {
+      imcraw.set_deferred(true);
+    }
     try {
-      imcraw.set_file(rawfile);
+      imcraw.set_file(rawfile,channels,patterns);
     } catch (const std::exception& e ) {
       std::cerr<<"failed to open and parse raw-file: "<<e.what()<<"\n";
       return 1;
@@ -219,7 +312,7 @@ int main(int argc, char* argv[])
     // list blocks
     if ( cfgopts.count("listblocks") == 1 )
     {
-      for ( imc::block blk: imcraw.blocks() )
+      for ( imc::block& blk: imcraw.blocks() )
       {
         // std::cout<<blk.get_key().get_info()<<"\n";
         std::cout<<blk.get_info()<<"\n";
@@ -261,6 +354,17 @@ int main(int argc, char* argv[])
       }
     }
 
+    // write (selected) channels to new raw-file
+    if ( cfgopts.count("write") == 1 )
+    {
+      try {
+        imcraw.write_raw(cfgopts.at("write"));
+      } catch (const std::exception& e) {
+        std::cerr<<"failed to write channels of "<<rawfile<<": "<<e.what()<<"\n";
+        return 1;
+      }
+    }
+
   }
 
   return 0;
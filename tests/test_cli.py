@@ -143,6 +143,144 @@ class TestCSVOutput:
         assert ';' in first_line, "Should use semicolon delimiter"
 
 
+class TestChannelSelection:
+    """Test selection of channels for output"""
+    
+    @pytest.fixture
+    def sample_file(self):
+        """Get path to sample file featuring multiple channels"""
+        sample = PROJECT_ROOT / "samples" / "exampleB.raw"
+        if not sample.exists():
+            pytest.skip(f"Sample file not found: {sample}")
+        return sample
+    
+    def run_output(self, sample_file, output_dir, *selection, option="--channel"):
+        """Print selected channels and list files written"""
+        output_dir.mkdir()
+        args = [str(CLI), str(sample_file), "--output", str(output_dir)]
+        for sel in selection:
+            args += [option, sel]
+        result = subprocess.run(args, capture_output=True, text=True)
+        assert result.returncode == 0
+        return sorted(f.name for f in output_dir.glob("*.csv"))
+    
+    def test_select_by_name(self, sample_file, tmp_path):
+        """Should print named channel only"""
+        assert self.run_output(sample_file, tmp_path / "out", "kanal1") == ["channel_377.csv"]
+    
+    def test_select_repeated(self, sample_file, tmp_path):
+        """Should print channels selected by uuid and name"""
+        assert self.run_output(sample_file, tmp_path / "out", "1038", "kanal2") == \
+            ["channel_1038.csv", "channel_707.csv"]
+    
+    def test_select_by_regex(self, sample_file, tmp_path):
+        """Should print channels matching regular expression"""
+        assert self.run_output(sample_file, tmp_path / "out", "kanal[0-9]",
+                               option="--channel-regex") == ["channel_377.csv", "channel_707.csv"]
+    
+    def test_select_literally(self, sample_file, tmp_path):
+        """Should match channel names given by --channel literally"""
+        assert self.run_output(sample_file, tmp_path / "out", "kanal.") == []
+    
+    def test_missing_argument(self, sample_file):
+        """Should reject option without argument"""
+        result = subprocess.run([str(CLI), str(sample_file), "--channel"],
+                                capture_output=True, text=True)
+        assert result.returncode != 0
+    
+    def test_invalid_regex(self, sample_file):
+        """Should report regular expression not being valid ECMAScript"""
+        result = subprocess.run([str(CLI), str(sample_file), "--channel-regex", "(?i)KANAL1", "-c"],
+                                capture_output=True, text=True)
+        assert result.returncode != 0
+        assert "invalid regular expression" in result.stderr
+
+
+class TestParallelDecoding:
+    """Test decoding channels by multiple threads"""
+    
+    @pytest.fixture
+    def sample_file(self):
+        """Get path to sample file featuring multiple channels"""
+        sample = PROJECT_ROOT / "samples" / "exampleB.raw"
+        if not sample.exists():
+            pytest.skip(f"Sample file not found: {sample}")
+        return sample
+    
+    def test_output_matches_sequential(self, sample_file, tmp_path):
+        """Output of multiple threads should equal sequential output"""
+        outputs = {}
+        for threads in ["1", "4", "0"]:
+            output_dir = tmp_path / f"threads_{threads}"
+            output_dir.mkdir()
+            result = subprocess.run(
+                [str(CLI), str(sample_file), "--output", str(output_dir), "--threads", threads],
+                capture_output=True,
+                text=True
+            )
+            assert result.returncode == 0
+            outputs[threads] = {f.name: f.read_text() for f in output_dir.glob("*.csv")}
+        assert len(outputs["1"]) == 3
+        assert outputs["4"] == outputs["1"]
+        assert outputs["0"] == outputs["1"]
+    
+    def test_invalid_threads(self, sample_file):
+        """Should reject invalid number of threads"""
+        result = subprocess.run([str(CLI), str(sample_file), "-c", "--threads", "many"],
+                                capture_output=True, text=True)
+        assert result.returncode != 0
+
+
+class TestWriteRaw:
+    """Test writing raw files comprising selected channels only"""
+    
+    @pytest.fixture
+    def sample_file(self):
+        """Get path to sample file featuring multiple channels"""
+        sample = PROJECT_ROOT / "samples" / "exampleB.raw"
+        if not sample.exists():
+            pytest.skip(f"Sample file not found: {sample}")
+        return sample
+    
+    def test_write_selected_channels(self, sample_file, tmp_path):
+        """Written file should list the selected channels only"""
+        output = tmp_path / "subset.raw"
+        result = subprocess.run(
+            [str(CLI), str(sample_file), "--channel-regex", "kanal[0-9]", "--write", str(output)],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0
+        assert output.stat().st_size < sample_file.stat().st_size
+        
+        result = subprocess.run([str(CLI), str(output), "--listchannels"],
+                                capture_output=True, text=True)
+        assert result.returncode == 0
+        assert "kanal1" in result.stdout and "kanal2" in result.stdout
+        assert "E06_6_121" not in result.stdout
+    
+    def test_write_no_channels(self, sample_file, tmp_path):
+        """Should fail if no channels are selected"""
+        output = tmp_path / "none.raw"
+        result = subprocess.run(
+            [str(CLI), str(sample_file), "--channel", "nomatch", "--write", str(output)],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode != 0
+        assert "no (selected) channels" in result.stderr
+        assert not output.exists()
+    
+    def test_write_to_invalid_path(self, sample_file, tmp_path):
+        """Should fail for output file in nonexistent directory"""
+        result = subprocess.run(
+            [str(CLI), str(sample_file), "--write", str(tmp_path / "missing" / "out.raw")],
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode != 0
+
+
 class TestMultipleFiles:
     """Test processing multiple sample files"""
     
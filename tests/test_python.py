@@ -20,6 +20,38 @@ DATASET_A = SAMPLES_DIR / "datasetA"
 DATASET_B = SAMPLES_DIR / "datasetB"
 
 
+@pytest.fixture
+def np():
+    """Require numpy for array output"""
+    return pytest.importorskip("numpy")
+
+
+def share_file_channels(sample_file):
+    """Decode channels of file into shared memory (in worker process)"""
+    return imctermite.imctermite(str(sample_file).encode(), deferred=True).share_channels()
+
+
+def modified_xy_dataset(tmp_path, xunit=b's', swap_samples=False):
+    """Copy XY sample file with modified unit of abscissa and/or its first two
+    samples swapped (rendering it non-monotonic)"""
+    sample_file = SAMPLES_DIR / "XY_dataset_example.dat"
+    if not sample_file.exists():
+        pytest.skip(f"Sample file not found: {sample_file}")
+    data = bytearray(sample_file.read_bytes())
+    
+    # abscissa is given by six-byte samples in microseconds
+    assert len(xunit) == 1
+    data = data.replace(b'|CR,1,15,1,1E-06,0,1,1,s;', b'|CR,1,15,1,1E-06,0,1,1,' + xunit + b';')
+    if swap_samples:
+        cs = data.index(b'|CS,')
+        start = data.index(b',', data.index(b',', data.index(b',', cs + 4) + 1) + 1) + 1 + 52376
+        data[start:start+12] = data[start+6:start+12] + data[start:start+6]
+    
+    output = tmp_path / "xy.dat"
+    output.write_bytes(bytes(data))
+    return str(output).encode()
+
+
 class TestModuleImport:
     """Test basic module functionality"""
     
@@ -78,6 +110,524 @@ class TestChannelListing:
         assert len(first_channel['xdata']) == len(first_channel['ydata'])
 
 
+class TestChannelMetadataTypes:
+    """Test native types of channel metadata"""
+    
+    @pytest.fixture
+    def channel(self):
+        """Get metadata of first channel of sample file"""
+        sample_file = SAMPLES_DIR / "sampleA.raw"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        return imctermite.imctermite(str(sample_file).encode()).get_channels(False)[0]
+    
+    def test_numeric_fields(self, channel):
+        """Numeric fields should keep native types"""
+        assert isinstance(channel['significantbits'], int)
+        assert isinstance(channel['buffer-size'], int)
+        assert isinstance(channel['xstepwidth'], float)
+        assert isinstance(channel['xoffset'], float)
+        assert isinstance(channel['group']['index'], int)
+        assert channel['buffer-size'] == 9608
+    
+    def test_trigger_times(self, channel):
+        """Trigger times should be datetime objects"""
+        import datetime
+        assert channel['trigger-time-nt'] == datetime.datetime(1980, 1, 1)
+        assert channel['trigger-time'] == datetime.datetime(2019, 5, 7, 4, 48, 26)
+    
+    def test_text_fields(self, channel):
+        """Text fields should be decoded strings"""
+        assert channel['xunit'] == 's'
+        assert channel['group']['name'] == 'pressure_Vacuum'
+
+
+class TestAbsoluteTime:
+    """Test abscissa given by absolute timestamps"""
+    
+    def test_equidistant_time_axis(self, np):
+        """Equidistant abscissa should be given by start and step"""
+        sample_file = SAMPLES_DIR / "sampleA.raw"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        
+        imc = imctermite.imctermite(str(sample_file).encode())
+        ch = imc.get_channels(True, True)[0]
+        
+        xtime = ch['xtime']
+        assert len(xtime) == len(ch['xdata'])
+        assert xtime.step == 5000000
+        
+        xtimearr = np.asarray(xtime)
+        assert xtimearr.dtype == np.dtype('datetime64[ns]')
+        assert xtimearr[0] == np.datetime64('2019-05-07T05:22:30.030', 'ns')
+        assert xtime[-1] == xtimearr[-1]
+        assert (np.asarray(xtime[10:20:3]) == xtimearr[10:20:3]).all()
+    
+    def test_time_axis_matches_xdata(self, np):
+        """Timestamps should correspond to trigger-time plus xdata"""
+        sample_file = SAMPLES_DIR / "XY_dataset_example.dat"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        
+        imc = imctermite.imctermite(str(sample_file).encode())
+        ch = imc.get_channels(True, True)[0]
+        
+        trigger = np.datetime64(ch['trigger-time'], 'ns')
+        expected = trigger + (np.asarray(ch['xdata'])*1.e9).round().astype('timedelta64[ns]')
+        assert isinstance(ch['xtime'], np.ndarray)
+        assert (ch['xtime'] == expected).all()
+    
+    def test_no_time_axis(self, np, tmp_path):
+        """Abscissa of XY channels should be no time axis without unit of time"""
+        imc = imctermite.imctermite(modified_xy_dataset(tmp_path, xunit=b'V'))
+        ch = imc.get_channels(True, True)[0]
+        assert ch['xunit'] == 'V'
+        assert ch['xtime'] is None
+
+
+class TestAlignChannels:
+    """Test alignment of channels onto common time grid"""
+    
+    @pytest.fixture
+    def imc_instances(self):
+        """Create IMC instances of files with different step widths"""
+        files = [SAMPLES_DIR / "sampleA.raw", SAMPLES_DIR / "sampleB.raw"]
+        for sample_file in files:
+            if not sample_file.exists():
+                pytest.skip(f"Sample file not found: {sample_file}")
+        return [imctermite.imctermite(str(f).encode()) for f in files]
+    
+    def test_align_multiple_files(self, np, imc_instances):
+        """Should align channels of several files in single array"""
+        aligned = imctermite.align_channels(imc_instances, method='linear')
+        
+        data = aligned['data']
+        assert data.dtype == np.float64
+        assert data.flags['C_CONTIGUOUS']
+        assert data.shape == (len(aligned['xtime']), 2)
+        assert [col['group']['name'] for col in aligned['columns']] == \
+            ['pressure_Vacuum', 'VehicleSpeed_HS']
+        
+        # finest step width of all channels (5ms) is used by default
+        assert aligned['xtime'].step == 5000000
+    
+    def test_aligned_values(self, np, imc_instances):
+        """Values on samples should be preserved by every method"""
+        ydata = imc_instances[0].get_channels(True)[0]['ydata']
+        for method in ['nearest', 'linear', 'hold']:
+            aligned = imctermite.align_channels(imc_instances, method=method)
+            column = aligned['data'][:, 0]
+            column = column[~np.isnan(column)]
+            assert np.allclose(column, ydata)
+    
+    def test_select_channels(self, np, imc_instances):
+        """Should align selected channels only"""
+        aligned = imctermite.align_channels(imc_instances, channels=['VehicleSpeed_HS'],
+                                            step=0.1, method='hold')
+        assert aligned['data'].shape[1] == 1
+        assert aligned['xtime'].step == 100000000
+    
+    def test_non_monotonic_abscissa(self, np, tmp_path):
+        """Should cover and align channel featuring non-monotonic abscissa"""
+        imc = imctermite.imctermite(modified_xy_dataset(tmp_path, swap_samples=True))
+        channel = imc.get_channels(True, include_time=True)[0]
+        xtime = np.asarray(channel['xtime'])
+        assert xtime[0] > xtime[1]
+        
+        aligned = imctermite.align_channels(imc, method='hold')
+        assert aligned['xtime'].start == xtime.min().astype(np.int64)
+        assert aligned['xtime'][-1] <= xtime.max()
+        column = aligned['data'][:, 0]
+        assert not np.isnan(column).any()
+        
+        # every row holds sample preceding it in order of time
+        order = np.argsort(xtime, kind='stable')
+        ydata = np.asarray(channel['ydata'])[order]
+        rows = np.searchsorted(xtime[order], np.asarray(aligned['xtime']), side='right') - 1
+        assert np.array_equal(column, ydata[rows])
+    
+    def test_size_limit(self, np, imc_instances):
+        """Should refuse to allocate arrays exceeding limit"""
+        with pytest.raises(ValueError, match='max_bytes'):
+            imctermite.align_channels(imc_instances, step=1.e-9)
+        with pytest.raises(ValueError, match='max_bytes'):
+            imctermite.align_channels(imc_instances, max_bytes=1024)
+    
+    def test_select_like_constructor(self, np, imc_instances):
+        """Should select channels by the same means as the constructor"""
+        import re
+        for channels in [b'VehicleSpeed_HS', re.compile(r'Vehicle.*'), ['nomatch', 'VehicleSpeed_HS']]:
+            aligned = imctermite.align_channels(imc_instances, channels=channels, step=0.1)
+            assert [col['group']['name'] for col in aligned['columns']] == ['VehicleSpeed_HS']
+        aligned = imctermite.align_channels(imc_instances, channels='Vehicle.*', step=0.1)
+        assert aligned['columns'] == []
+    
+    def test_invalid_step(self, np, imc_instances):
+        """Should reject step widths not being positive"""
+        for step in [0, -0.1, 1.e-12]:
+            with pytest.raises(ValueError, match='step width'):
+                imctermite.align_channels(imc_instances, step=step)
+    
+    def test_invalid_method(self, np, imc_instances):
+        """Should reject unknown interpolation method"""
+        with pytest.raises(RuntimeError):
+            imctermite.align_channels(imc_instances, method='cubic')
+
+
+class TestChannelCache:
+    """Test process-wide cache of decoded channels"""
+    
+    @pytest.fixture
+    def cache(self):
+        """Enable cache for single test only"""
+        imctermite.clear_cache()
+        imctermite.set_cache_budget(64*1024*1024)
+        yield imctermite
+        imctermite.set_cache_budget(0)
+        imctermite.clear_cache()
+    
+    @pytest.fixture
+    def sample_file(self):
+        """Get sample file"""
+        sample_file = SAMPLES_DIR / "sampleA.raw"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        return str(sample_file).encode()
+    
+    def test_disabled_by_default(self, sample_file):
+        """Should not retain any channels without a budget"""
+        imctermite.imctermite(sample_file).get_channels(True)
+        stats = imctermite.get_cache_stats()
+        assert stats['budget'] == 0
+        assert stats['entries'] == 0
+    
+    def test_hits_and_misses(self, cache, sample_file):
+        """Should decode channels once per file and serve them from cache"""
+        expected = imctermite.imctermite(sample_file).get_channels(True)
+        first = imctermite.imctermite(sample_file).get_channels(True)
+        second = imctermite.imctermite(sample_file).get_channels(True)
+        assert first == expected
+        assert second == expected
+        
+        stats = cache.get_cache_stats()
+        assert stats['misses'] == len(expected)
+        assert stats['hits'] == 2*len(expected)
+        assert stats['entries'] == len(expected)
+        assert 0 < stats['size'] <= stats['budget']
+    
+    def test_eviction(self, cache, sample_file):
+        """Should evict channels exceeding the budget"""
+        imc = imctermite.imctermite(sample_file)
+        imc.get_channels(True)
+        size = cache.get_cache_stats()['size']
+        
+        cache.set_cache_budget(size - 1)
+        stats = cache.get_cache_stats()
+        assert stats['evictions'] >= 1
+        assert stats['size'] <= size - 1
+        
+        # evicted channels are decoded again from file
+        assert imc.get_channels(True)[0]['ydata']
+        assert cache.get_cache_stats()['misses'] >= 2
+    
+    def test_clear(self, cache, sample_file):
+        """Should remove all channels and reset statistics"""
+        imctermite.imctermite(sample_file).get_channels(True)
+        cache.clear_cache()
+        stats = cache.get_cache_stats()
+        assert stats['entries'] == 0
+        assert stats['size'] == 0
+        assert stats['hits'] == stats['misses'] == stats['evictions'] == 0
+
+
+class TestSharedChannels:
+    """Test export of channels via shared memory"""
+    
+    @pytest.fixture
+    def sample_files(self):
+        """Get sample files"""
+        files = sorted(DATASET_A.glob("*.raw"))[:4]
+        if not files:
+            pytest.skip(f"No sample files found in {DATASET_A}")
+        return files
+    
+    def test_descriptors(self, np, sample_files):
+        """Should describe channels by metadata and block of shared memory only"""
+        channels = share_file_channels(sample_files[0])
+        try:
+            for ch in channels:
+                assert 'ydata' not in ch and 'xdata' not in ch
+                assert ch['shm']['dtype'] == 'float64'
+                assert ch['shm']['shape'][0] == 1
+        finally:
+            imctermite.attach_channels(channels)
+    
+    def test_attach_in_parent(self, np, sample_files):
+        """Should attach to channels decoded by pool of workers"""
+        import multiprocessing
+        with multiprocessing.Pool(2) as pool:
+            shared = pool.map(share_file_channels, sample_files)
+        
+        for sample_file, channels in zip(sample_files, shared):
+            attached = imctermite.attach_channels(channels)
+            expected = imctermite.imctermite(str(sample_file).encode()).get_channels(True)
+            assert len(attached) == len(expected)
+            for ch, ex in zip(attached, expected):
+                assert ch['uuid'] == ex['uuid']
+                assert isinstance(ch['ydata'], np.ndarray)
+                assert np.array_equal(ch['ydata'], ex['ydata'])
+                assert ch['xdata'] is None
+    
+    def test_xy_channel(self, np):
+        """Should share abscissa of channels featuring two components"""
+        sample_file = SAMPLES_DIR / "XY_dataset_example.dat"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        channels = share_file_channels(sample_file)
+        assert channels[0]['shm']['shape'][0] == 2
+        attached = imctermite.attach_channels(channels)
+        expected = imctermite.imctermite(str(sample_file).encode()).get_channels(True)
+        assert np.array_equal(attached[0]['xdata'], expected[0]['xdata'])
+        assert np.array_equal(attached[0]['ydata'], expected[0]['ydata'])
+    
+    def test_decoded_in_single_pass(self, np, sample_files):
+        """Should not retain decoded channels when sharing deferred files"""
+        imc = imctermite.imctermite(str(sample_files[0]).encode(), deferred=True)
+        imctermite.attach_channels(imc.share_channels())
+        assert imc.get_decoded_size() == 0
+    
+    def test_blocks_unlinked(self, np, sample_files):
+        """Blocks of shared memory should be unlinked once attached"""
+        from multiprocessing import shared_memory
+        channels = share_file_channels(sample_files[0])
+        imctermite.attach_channels(channels)
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=channels[0]['shm']['name'])
+
+
+class TestChannelSelection:
+    """Test selection of channels when opening files"""
+    
+    @pytest.fixture
+    def sample_file(self):
+        """Get sample file featuring multiple channels"""
+        sample_file = SAMPLES_DIR / "exampleB.raw"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        return str(sample_file).encode()
+    
+    def names(self, sample_file, channels):
+        """Get names of selected channels"""
+        imc = imctermite.imctermite(sample_file, channels=channels)
+        return [ch['group']['name'] for ch in imc.get_channels(False)]
+    
+    def test_select_all_by_default(self, sample_file):
+        """Should process all channels without selection"""
+        assert self.names(sample_file, None) == ['E06_6_121', 'kanal1', 'kanal2']
+    
+    def test_select_by_name_and_uuid(self, sample_file):
+        """Should select channels by name or uuid"""
+        assert self.names(sample_file, 'kanal2') == ['kanal2']
+        assert self.names(sample_file, ['377', 'E06_6_121']) == ['E06_6_121', 'kanal1']
+    
+    def test_select_by_regex(self, sample_file):
+        """Should select channels by regular expression"""
+        import re
+        assert self.names(sample_file, re.compile(r'kanal\d')) == ['kanal1', 'kanal2']
+        assert self.names(sample_file, 'nomatch') == []
+    
+    def test_reject_unsupported_regex(self, sample_file):
+        """Should report flags and invalid regular expressions"""
+        import re
+        with pytest.raises(ValueError):
+            self.names(sample_file, re.compile('KANAL1', re.I))
+        with pytest.raises(ValueError):
+            self.names(sample_file, re.compile('(?i)KANAL1'))
+        with pytest.raises(RuntimeError, match='invalid regular expression'):
+            self.names(sample_file, re.compile(r'(?P<name>kanal1)'))
+    
+    def test_select_literally(self, sample_file):
+        """Should match names given as str or bytes literally"""
+        assert self.names(sample_file, 'kanal.') == []
+        assert self.names(sample_file, b'kanal1(') == []
+        assert self.names(sample_file, [b'kanal1', 'kanal2']) == ['kanal1', 'kanal2']
+    
+    def test_selected_data(self, sample_file):
+        """Selected channels should equal those of entire file"""
+        selected = imctermite.imctermite(sample_file, channels='kanal1').get_channels(True)
+        complete = imctermite.imctermite(sample_file).get_channels(True)
+        assert selected == [ch for ch in complete if ch['uuid'] == '377']
+    
+    def test_selected_data_of_all_samples(self):
+        """Every selected channel should equal that of the entire file"""
+        sample_files = sorted(SAMPLES_DIR.glob("**/*.raw"))
+        if not sample_files:
+            pytest.skip(f"No sample files found in {SAMPLES_DIR}")
+        for sample_file in sample_files:
+            complete = imctermite.imctermite(str(sample_file).encode()).get_channels(True)
+            for ch in complete:
+                selected = imctermite.imctermite(str(sample_file).encode(),
+                                                 channels=ch['uuid']).get_channels(True)
+                assert selected == [ch], f"{sample_file.name}: {ch['uuid']}"
+    
+    def test_submit_file(self, sample_file):
+        """Should apply selection to submitted file"""
+        imc = imctermite.imctermite(sample_file)
+        imc.submit_file(sample_file, channels='kanal1')
+        assert len(imc.get_channels(False)) == 1
+
+
+class TestParallelDecoding:
+    """Test decoding channels of single file by multiple threads"""
+    
+    @pytest.fixture
+    def sample_file(self):
+        """Get sample file featuring multiple channels"""
+        sample_file = SAMPLES_DIR / "exampleB.raw"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        return str(sample_file).encode()
+    
+    def test_threads_match_sequential(self, sample_file):
+        """Channels decoded by multiple threads should equal sequential ones"""
+        expected = imctermite.imctermite(sample_file).get_channels(True)
+        for threads in [2, 8, 0]:
+            imc = imctermite.imctermite(sample_file, threads=threads)
+            assert imc.get_channels(True) == expected
+    
+    def test_submit_file_with_threads(self, sample_file):
+        """Should decode submitted file by multiple threads"""
+        imc = imctermite.imctermite(sample_file)
+        imc.submit_file(sample_file, threads=4)
+        assert len(imc.get_channels(True)) == 3
+
+
+class TestWriteRaw:
+    """Test writing raw files comprising selected channels only"""
+    
+    @pytest.fixture
+    def sample_file(self):
+        """Get sample file featuring multiple channels"""
+        sample_file = SAMPLES_DIR / "exampleB.raw"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        return sample_file
+    
+    @staticmethod
+    def by_name(channels):
+        """Map channels (without their file specific uuid) to their names"""
+        return {ch['group']['name']: {k: v for k, v in ch.items() if k != 'uuid'}
+                for ch in channels}
+    
+    def test_write_selected_channel(self, sample_file, tmp_path):
+        """Written file should comprise the selected channel only"""
+        output = tmp_path / "subset.raw"
+        imctermite.write_raw(str(sample_file).encode(), str(output).encode(), channels='kanal1')
+        assert output.stat().st_size < sample_file.stat().st_size
+        
+        written = self.by_name(imctermite.imctermite(str(output).encode()).get_channels(True))
+        expected = self.by_name(imctermite.imctermite(str(sample_file).encode()).get_channels(True))
+        assert list(written) == ['kanal1']
+        assert written['kanal1'] == expected['kanal1']
+    
+    def test_write_no_channels(self, sample_file, tmp_path):
+        """Should refuse to write file if no channels are selected"""
+        output = tmp_path / "none.raw"
+        with pytest.raises(RuntimeError, match='no \\(selected\\) channels'):
+            imctermite.write_raw(str(sample_file).encode(), str(output).encode(), channels='nomatch')
+        assert not output.exists()
+    
+    def test_write_all_channels(self, sample_file, tmp_path):
+        """Written file should reproduce all channels without selection"""
+        output = tmp_path / "all.raw"
+        imctermite.write_raw(str(sample_file).encode(), str(output).encode())
+        
+        written = self.by_name(imctermite.imctermite(str(output).encode()).get_channels(True))
+        expected = self.by_name(imctermite.imctermite(str(sample_file).encode()).get_channels(True))
+        assert written == expected
+    
+    def test_write_xy_channel(self, tmp_path):
+        """Written file should preserve channels featuring two components"""
+        sample_file = SAMPLES_DIR / "XY_dataset_example.dat"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        output = tmp_path / "xy.raw"
+        imctermite.write_raw(str(sample_file).encode(), str(output).encode())
+        
+        written = self.by_name(imctermite.imctermite(str(output).encode()).get_channels(True))
+        expected = self.by_name(imctermite.imctermite(str(sample_file).encode()).get_channels(True))
+        assert written == expected
+
+
+class TestRawCounts:
+    """Test getting samples as raw counts in their native numeric type"""
+    
+    @staticmethod
+    def scaled(counts, scale):
+        """Apply factor and offset to raw counts"""
+        return counts*scale['factor'] + scale['offset']
+    
+    def test_native_dtype(self, np):
+        """Raw counts should keep the native numeric type of the samples"""
+        sample_file = SAMPLES_DIR / "sampleB.raw"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        imc = imctermite.imctermite(str(sample_file).encode())
+        ch = imc.get_channels(True, raw_counts=True)[0]
+        assert isinstance(ch['ydata'], np.ndarray)
+        assert ch['ydata'].dtype == np.dtype('int16')
+        assert ch['ydata'].nbytes == ch['buffer-size']
+        assert ch['xdata'] is None
+    
+    def test_scale_without_range(self, np):
+        """Channels without CR block should not be scaled at all"""
+        sample_file = DATASET_B / "datasetB_1.raw"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        imc = imctermite.imctermite(str(sample_file).encode(), channels='279', deferred=True)
+        ch = imc.get_channels(True, raw_counts=True)[0]
+        assert ch['yscale'] == {'factor': 1.0, 'offset': 0.0}
+    
+    def test_deferred_decodes_nothing(self, np):
+        """Raw counts of deferred files should not decode any channels"""
+        sample_file = SAMPLES_DIR / "sampleA.raw"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        imc = imctermite.imctermite(str(sample_file).encode(), deferred=True)
+        channels = imc.get_channels(True, raw_counts=True)
+        assert len(channels[0]['ydata']) > 0
+        assert imc.get_decoded_size() == 0
+        
+        imc.get_channels(True)
+        assert imc.get_decoded_size() > 0
+        assert imctermite.imctermite(str(sample_file).encode()).get_decoded_size() > 0
+    
+    def test_scaled_counts_match_data(self, np):
+        """Scaling raw counts should reproduce the decoded data"""
+        for sample_file in [SAMPLES_DIR / "sampleA.raw", SAMPLES_DIR / "sampleB.raw",
+                            SAMPLES_DIR / "exampleB.raw"]:
+            if not sample_file.exists():
+                pytest.skip(f"Sample file not found: {sample_file}")
+            imc = imctermite.imctermite(str(sample_file).encode())
+            expected = imc.get_channels(True)
+            for ch, exp in zip(imc.get_channels(True, raw_counts=True), expected):
+                assert ch['uuid'] == exp['uuid']
+                assert np.allclose(self.scaled(ch['ydata'], ch['yscale']), exp['ydata'])
+    
+    def test_xy_channel(self, np):
+        """Raw counts of abscissa should be provided for XY channels"""
+        sample_file = SAMPLES_DIR / "XY_dataset_example.dat"
+        if not sample_file.exists():
+            pytest.skip(f"Sample file not found: {sample_file}")
+        imc = imctermite.imctermite(str(sample_file).encode())
+        exp = imc.get_channels(True)[0]
+        ch = imc.get_channels(True, raw_counts=True)[0]
+        assert ch['xdata'].dtype == np.dtype('uint64')
+        assert np.allclose(self.scaled(ch['xdata'], ch['xscale']), exp['xdata'])
+        assert np.allclose(self.scaled(ch['ydata'], ch['yscale']), exp['ydata'])
+
+
 class TestDataIntegrity:
     """Test data extraction and validation"""
     